@@ -0,0 +1 @@
+from moleskin import startup
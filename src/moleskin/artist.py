@@ -1,12 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Tuple, Generic
-from pygame import Surface
+from typing import Tuple, Generic, Optional
+from pygame import Surface, Color
 from moleskin.layout import Position
 from moleskin.state import State, SelectedState
 from moleskin.template import Template, Form
 
 
 class Artist(ABC, Generic[State, SelectedState, Form]):
+    __slots__ = ('_template', '__weakref__')
     _origin: Position = (0, 0)
 
     def __init__(self, template: Template[State, SelectedState, Form]):
@@ -17,15 +18,24 @@ class Artist(ABC, Generic[State, SelectedState, Form]):
         return self._template
 
     def bind_template(self, state: State, component):
-        return self._template.bind(self._template.select_state(state), component) if self._template else None
+        return self._template.bind_state(state, component) if self._template else None
 
     @abstractmethod
     def draw(self, surface: Surface, form: Form, component):
         pass
 
+    def blit_source(self, surface: Surface, form: Form, component) -> Optional[Surface]:
+        return None
+
+    def solid_fill(self, form: Form, component) -> Optional[Color]:
+        return None
+
     def __getstate__(self):
         return self._template
 
+    def __setstate__(self, template: Template[State, SelectedState, Form]):
+        Artist.__init__(self, template)
+
 
 Artists = Tuple[Artist, ...]
 
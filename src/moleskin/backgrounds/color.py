@@ -9,7 +9,9 @@ BackgroundColorForm = Tuple[
 ]
 
 
-class BackgroundColorTemplate(FixedFormTemplate[BackgroundColorForm]):
+class BackgroundColorTemplate(FixedFormTemplate[BackgroundColorForm], interned=True):
+    __slots__ = ('_color',)
+
     @classmethod
     def _hexcode_to_color(cls, hexcode: str):
         try:
@@ -38,9 +40,15 @@ class BackgroundColorTemplate(FixedFormTemplate[BackgroundColorForm]):
 
 
 class BackgroundColor(Artist[State, SelectedState, BackgroundColorForm]):
+    __slots__ = ()
+
     def __init__(self, template: Union[BackgroundColorForm, BackgroundColorTemplate]):
         super().__init__(template if isinstance(template, Template) else BackgroundColorTemplate(*template))
 
+    def solid_fill(self, form: BackgroundColorForm, component):
+        color, = form
+        return color
+
     def draw(self, surface, form: BackgroundColorForm, component):
         color, = form
         surface.fill(color)
@@ -1,53 +1,182 @@
 from os import getenv
 from pathlib import Path
-from typing import Tuple, Literal, get_args, cast, Union, Generic
-import pygame
-from PIL.Image import Image
+from typing import Tuple, Union, Generic, Optional
+from warnings import warn
+from weakref import WeakSet, ref
+from concurrent.futures import Future, wait
+from pygame import Surface, Color
 from moleskin.artist import Artist
+from moleskin.performance.atlas import AtlasRegion, TextureAtlas
 from moleskin.performance.images import ImageCache
+from moleskin.performance.surfaces import SurfaceCache
+from moleskin.startup import lazy_assets, load_module
 from moleskin.state import State, SelectedState
 from moleskin.template import FixedFormTemplate, Template, Form
 
+Scale = bool
+Placeholder = Color
+
 BackgroundImageForm = Tuple[
-    Image
+    Optional[Surface],
+    Scale,
+    Placeholder
 ]
 
 
 class BackgroundImageTemplate(
     FixedFormTemplate[BackgroundImageForm]
 ):
+    __slots__ = (
+        '_image_path', '_scale', '_placeholder', '_image', '_hydrated', '_waiting_components', '_bound_form', '_error'
+    )
     _cache_size_varname = 'GAME_BG_IMAGE_CACHE_SIZE'
-    _cache = ImageCache(getenv(_cache_size_varname))
-
-    def __init__(self, image_path: Union[str, Path]):
-        self._image = self._cache[image_path]
-        super().__init__(self._image)
+    _shared_group_varname = 'GAME_BG_IMAGE_SHARED_GROUP'
+    _shared_size_varname = 'GAME_BG_IMAGE_SHARED_SIZE'
+    _cache: ImageCache = None
+    _surface_cache_size_varname = 'GAME_BG_SURFACE_CACHE_SIZE'
+    surface_cache = SurfaceCache(getenv(_surface_cache_size_varname, '256mib'))
+    _default_placeholder = Color(0, 0, 0)
+
+    def __init__(
+            self,
+            image_path: Union[str, Path, AtlasRegion],
+            scale: Scale = False,
+            placeholder: Optional[Placeholder] = None,
+            lazy: Optional[bool] = None
+    ):
+        self._image_path, self._scale, self._placeholder = (
+            image_path, scale, self._default_placeholder if placeholder is None else placeholder
+        )
+        self._image: Optional[Future] = None
+        self._hydrated = False
+        self._error: Optional[BaseException] = None
+        self._waiting_components: WeakSet = WeakSet()
+        self._bound_form: BackgroundImageForm = None, self._scale, self._placeholder
+        super().__init__(self._image_path, self._scale, self._placeholder)
+        if not (lazy_assets() if lazy is None else lazy):
+            self._hydrate()
 
+    @classmethod
+    def image_cache_created(cls) -> bool:
+        return BackgroundImageTemplate._cache is not None
 
-SupportedImageFormat = Literal['P', 'RGB', 'RGBX', 'RGBA', 'ARGB', 'BGRA']
+    @classmethod
+    def image_cache(cls) -> ImageCache:
+        if BackgroundImageTemplate._cache is None:
+            size, group = getenv(cls._cache_size_varname, '512mib'), getenv(cls._shared_group_varname)
+            shared_image_cache = group and load_module('moleskin.performance.shared_images').SharedImageCache
+            if shared_image_cache and shared_image_cache.is_supported():
+                BackgroundImageTemplate._cache = shared_image_cache(size, group, getenv(cls._shared_size_varname))
+            else:
+                if group:
+                    warn(f"shared image group '{group}' is not supported on this platform, using a private image cache")
 
+                BackgroundImageTemplate._cache = ImageCache(size)
 
-class BackgroundImage(Artist[State, SelectedState, Form], Generic[State, SelectedState, Form]):
-    _supported_image_formats: Tuple[SupportedImageFormat, ...] = get_args(SupportedImageFormat)
+        return BackgroundImageTemplate._cache
 
     @classmethod
-    def _cast_image_format(cls, image_format: str) -> SupportedImageFormat:
-        if image_format in cls._supported_image_formats:
-            return cast(SupportedImageFormat, image_format)
+    def use_image_cache(cls, cache: ImageCache):
+        BackgroundImageTemplate._cache = cache
+
+    def __setstate__(self, form: Tuple):
+        self._form = form
+        self._image_path, self._scale, self._placeholder = form
+        self._image = self._error = None
+        self._hydrated = False
+        self._waiting_components = WeakSet()
+        self._bound_form = None, self._scale, self._placeholder
+
+    def _hydrate(self):
+        if self._hydrated:
+            return
+
+        self._hydrated = True
+        if isinstance(self._image_path, AtlasRegion):
+            self._bound_form = (
+                TextureAtlas.open(self._image_path.atlas)[self._image_path.name], self._scale, self._placeholder
+            )
+        else:
+            self._image = self.image_cache().fetch(self._image_path)
+
+    @staticmethod
+    def _on_decoded(component_ref: ref):
+        component = component_ref()
+        if component is not None:
+            component.invalidate_threadsafe()
+
+    def _failed(self) -> bool:
+        if self._error is None and self._image.exception() is not None:
+            self._error = self._image.exception()
+            warn(f"cannot load background image '{self._image_path}': {self._error}")
+
+        return self._error is not None
+
+    @property
+    def image(self):
+        self._hydrate()
+        return self._image.result() if self._image and not (self._image.done() and self._failed()) else None
+
+    def wait_loaded(self, timeout: Optional[float] = None) -> bool:
+        self._hydrate()
+        if self._image:
+            wait((self._image,), timeout)
+
+        return self.is_loaded and not (self._image and self._failed())
+
+    @property
+    def error(self):
+        return self._error
+
+    @property
+    def is_loaded(self):
+        return self._hydrated and (not self._image or self._image.done())
+
+    @property
+    def scale(self):
+        return self._scale
+
+    @property
+    def placeholder(self):
+        return self._placeholder
+
+    def bind(self, _, component):
+        self._hydrate()
+        if self._image and self._image.done():
+            if not self._failed():
+                surface = self.surface_cache.convert(self._image.result())
+                if self._bound_form[0] is not surface:
+                    self._bound_form = surface, self._scale, self._placeholder
+        elif self._image and component is not None and component not in self._waiting_components:
+            self._waiting_components.add(component)
+            component_ref = ref(component)
+            self._image.add_done_callback(lambda _: self._on_decoded(component_ref))
+
+        return self._bound_form
 
-        raise UserWarning(f"unsupported image format {image_format}")
 
-    @classmethod
-    def _convert_pil_image(cls, image: Image):
-        return pygame.image.frombytes(image.tobytes(), image.size, cls._cast_image_format(image.format))
+class BackgroundImage(Artist[State, SelectedState, Form], Generic[State, SelectedState, Form]):
+    __slots__ = ()
 
-    def __init__(self, template: Union[str, Image, BackgroundImageTemplate]):
+    def __init__(self, template: Union[str, Path, AtlasRegion, BackgroundImageTemplate]):
         super().__init__(template if isinstance(template, Template) else BackgroundImageTemplate(template))
 
+    def blit_source(self, surface, form: BackgroundImageForm, component):
+        image, scale, _ = form
+        return None if image is None else (
+            BackgroundImageTemplate.surface_cache.scale(image, surface.get_size()) if scale else image
+        )
+
     def draw(self, surface, form: BackgroundImageForm, component):
-        image, = form
-        surface.blit(self._convert_pil_image(image), self._origin)
+        image, scale, placeholder = form
+        if image is None:
+            surface.fill(placeholder)
+            return
 
+        surface.blit(
+            BackgroundImageTemplate.surface_cache.scale(image, surface.get_size()) if scale else image,
+            self._origin
+        )
 
-__all__ = ['BackgroundImage']
 
+__all__ = ['BackgroundImageForm', 'BackgroundImageTemplate', 'BackgroundImage']
@@ -1,22 +1,40 @@
 from __future__ import annotations
 from abc import ABC
-from typing import Tuple, Union, Optional, Generic
+from os import getenv
+from threading import Lock
+from typing import Tuple, Union, Optional, Generic, List, Any
+from weakref import WeakSet
+import pygame
 from pygame import Rect, Color, Surface
 from moleskin.artist import Artist, Form, Artists
 from moleskin.backgrounds.color import BackgroundColorForm, BackgroundColor, BackgroundColorTemplate
 from moleskin.foreground import LeftAlignment, ForegroundForm, ForegroundTemplate, Foreground
 from moleskin.layout import Layout, Size, Sizes
+from moleskin.performance.spatial import GridIndex
+from moleskin.performance.textures import TextureCache
 from moleskin.state import State, SelectedState
 from moleskin.template import Template
 
 
 class Component(Artist[State, SelectedState, Form], ABC, Generic[State, SelectedState, Form]):
+    __slots__ = (
+        '_background', '_foreground', '_children', '_layout', '_cached', '_state', '_artists', '_current_size',
+        '_current_artist_subsurfaces', '_current_surface_size', '_forms', '_parent', '_dirty', '_dirty_descendants',
+        '_layout_dirty', '_hit_index', '_artist_surfaces_parent', '_current_artist_surfaces', '_exposed',
+        '_foreground_form', '_foreground_size', '_layout_changed'
+    )
     _default_font = 'dejavusans'
     _default_font_size = 11
     _default_antialias = False
     _default_color = Color(0, 0, 0)
     _default_bg_color = None
     _default_alignment = LeftAlignment()
+    _max_layout_passes = 8
+    _pending_lock = Lock()
+    _pending_invalidations: WeakSet = WeakSet()
+    invalidate_event = pygame.event.custom_type()
+    _texture_cache_size_varname = 'GAME_TEXTURE_CACHE_SIZE'
+    texture_cache = TextureCache(getenv(_texture_cache_size_varname, '64mib'))
 
     def __init__(
             self,
@@ -24,7 +42,8 @@ class Component(Artist[State, SelectedState, Form], ABC, Generic[State, Selected
             background: Union[str, Color, BackgroundColorForm, BackgroundColor, Template, Artist],
             foreground: Optional[Union[str, ForegroundForm, ForegroundTemplate, Foreground]] = None,
             children: Children = (),
-            layout: Layout = None
+            layout: Layout = None,
+            cached: bool = False
     ):
         super().__init__(template)
         self._background, self._foreground, self._children, self._layout = (
@@ -47,46 +66,340 @@ class Component(Artist[State, SelectedState, Form], ABC, Generic[State, Selected
             children,
             layout
         )
-        self._state: ComponentState = (self._template, self._background, self._foreground, self._children, self._layout)
+        self._cached = cached
+        self._state: ComponentState = (
+            self._template, self._background, self._foreground, self._children, self._layout, self._cached
+        )
         self._artists: Artists = (self._background, *self._children, *((self._foreground,) if self._foreground else ()))
-        self._current_size = self._foreground.size if self._foreground else (0, 0)
-        self._current_artist_subsurfaces: Tuple[Surface, ...] = ()
+        self._current_size: Optional[Size] = None
+        self._current_artist_subsurfaces: Tuple[Rect, ...] = ()
+        self._current_surface_size: Size = (0, 0)
+        self._forms: Tuple[Any, ...] = ()
+        self._parent: Optional[Component] = None
+        self._dirty = True
+        self._dirty_descendants = False
+        self._layout_dirty = False
+        self._layout_changed = True
+        self._hit_index: Optional[GridIndex] = None
+        self._artist_surfaces_parent: Optional[Surface] = None
+        self._current_artist_surfaces: Tuple[Surface, ...] = ()
+        self._exposed = False
+        self._foreground_form: Optional[ForegroundForm] = None
+        self._foreground_size: Optional[Size] = None
+        for child in self._children:
+            child._parent = self
+
+    @staticmethod
+    def _clip(rect: Rect, bounds: Rect) -> Rect:
+        clipped_rect = rect.clip(bounds)
+        return clipped_rect if clipped_rect.width and clipped_rect.height else Rect(0, 0, 0, 0)
 
     def _organized_artists(self, screen: Surface) -> Tuple[
         Size,
         Tuple[Rect, ...]
     ]:
-        child_sizes: Sizes = tuple(child._current_size for child in self._children)
+        child_sizes: Sizes = tuple(child.size for child in self._children)
         size, child_positions = (
-            self._layout.arrange(screen, child_sizes) if self._layout else
-            (self._foreground.size, ())
+            self._layout.arrangement(screen, child_sizes) if self._layout else
+            (self._text_size(), ())
         )
-        return size, tuple(Rect(*position, *size) for position, size in zip(
+        bounds = screen.get_rect()
+        return size, tuple(self._clip(Rect(*position, *size), bounds) for position, size in zip(
             (self._origin, *child_positions, self._origin),
             (size, *child_sizes, size)
         ))
 
+    def _text_size(self) -> Size:
+        return self._foreground.size if self._foreground_size is None else self._foreground_size
+
+    def _needs_layout(self, surface: Surface):
+        return (
+            self._layout_dirty or
+            not self._current_artist_subsurfaces or
+            self._current_surface_size != surface.get_size()
+        )
+
+    def _artist_surfaces(self, surface: Surface) -> Tuple[Surface, ...]:
+        if self._artist_surfaces_parent is not surface:
+            self._artist_surfaces_parent = surface
+            self._current_artist_surfaces = tuple(surface.subsurface(rect) for rect in self._current_artist_subsurfaces)
+
+        return self._current_artist_surfaces
+
+    def _mark_layout_changed(self):
+        self._layout_changed = True
+        parent = self._parent
+        while parent and not parent._layout_changed:
+            parent._layout_changed = True
+            parent = parent._parent
+
+    def _relayout(self, surface: Surface):
+        self._mark_layout_changed()
+        previous_size = self.size
+        self._current_surface_size = surface.get_size()
+        self._current_size, self._current_artist_subsurfaces = self._organized_artists(surface)
+        self._layout_dirty = False
+        self._hit_index = None
+        self._artist_surfaces_parent = None
+        self._dirty = True
+        if self._parent and self._current_size != previous_size:
+            self._parent._child_resized(self)
+
+    def _child_resized(self, child: Component):
+        self._layout_dirty = True
+
     def __getstate__(self):
         return self._state
 
     def __setstate__(self, state: State):
         self.__init__(*state)
 
+    @property
+    def parent(self):
+        return self._parent
+
+    @property
+    def children(self):
+        return self._children
+
+    @property
+    def cached(self):
+        return self._cached
+
+    @property
+    def is_dirty(self):
+        return self._dirty or self._dirty_descendants
+
+    @property
+    def size(self) -> Size:
+        if self._current_size is None:
+            self._current_size = self._text_size() if self._foreground else (0, 0)
+
+        return self._current_size
+
+    @property
+    def layout_changed(self):
+        return self._layout_changed
+
+    @property
+    def background(self):
+        return self._background
+
+    @property
+    def foreground(self):
+        return self._foreground
+
+    @property
+    def artist_rects(self):
+        return self._current_artist_subsurfaces
+
+    @property
+    def is_invalidated(self):
+        return self._dirty
+
+    def mark_clean(self):
+        self._dirty = self._dirty_descendants = False
+
+    def mark_layout_seen(self):
+        self._layout_changed = False
+
+    def layout(self, surface: Surface) -> bool:
+        relaid_out = self._needs_layout(surface)
+        if relaid_out:
+            self._relayout(surface)
+
+        for child_surface, child in zip(self._artist_surfaces(surface)[1:], self._children):
+            relaid_out = child.layout(child_surface) or relaid_out
+
+        return relaid_out
+
+    def settle_layout(self, surface: Surface):
+        for _ in range(self._max_layout_passes):
+            if not self.layout(surface):
+                break
+
+    def invalidate_layout(self):
+        self._mark_layout_changed()
+        self._layout_dirty = True
+        self.invalidate()
+
+    def invalidate(self):
+        self._dirty = True
+        parent = self._parent
+        while parent and not parent._dirty_descendants:
+            parent._dirty_descendants = True
+            parent = parent._parent
+
+    def invalidate_threadsafe(self):
+        with Component._pending_lock:
+            wake = not Component._pending_invalidations
+            Component._pending_invalidations.add(self)
+
+        if wake:
+            try:
+                pygame.event.post(pygame.event.Event(Component.invalidate_event))
+            except pygame.error:
+                pass
+
+    @classmethod
+    def apply_pending_invalidations(cls) -> int:
+        with Component._pending_lock:
+            components = tuple(Component._pending_invalidations)
+            Component._pending_invalidations.clear()
+
+        for component in components:
+            component.invalidate()
+
+        return len(components)
+
     def bind_template(self, state: State, component=None):
-        super().bind_template(state, self)
+        return super().bind_template(state, self) if self._template else state
 
-    def draw(self, surface, state: State, component=None):
-        if not self._current_artist_subsurfaces:
-            self._current_size, self._current_artist_subsurfaces = self._organized_artists(surface)
+    def bind_foreground(self, state: State) -> ForegroundForm:
+        form = self._foreground.bind_template(state, self)
+        if form is not self._foreground_form:
+            self._foreground_form = form
+            size = self._foreground.form_size(form)
+            if size != self._text_size() and not self._layout:
+                self.invalidate_layout()
 
-        for subsurface, artist in zip(self._current_artist_subsurfaces, self._artists):
-            artist.draw(surface.subsurface(subsurface), artist.bind_template(state, self), self)
+            self._foreground_size = size
+
+        return form
+
+    def bind_children(self, state: State) -> Tuple[Any, ...]:
+        return tuple(child.bind_template(state, self) for child in self._children)
+
+    @staticmethod
+    def _form_changed(previous, form):
+        return previous is not form and previous != form
+
+    def expose(self):
+        if self._cached:
+            self._exposed = True
+        else:
+            self._dirty = True
+
+    def _draw_all(self, surface: Surface, forms: Tuple[Any, ...]) -> List[Rect]:
+        for child in self._children:
+            child.expose()
+
+        for artist_surface, artist, form in zip(self._artist_surfaces(surface), self._artists, forms):
+            artist.draw(artist_surface, form, self)
+
+        return [self._current_artist_subsurfaces[0].move(surface.get_abs_offset())]
+
+    def _draw_changed(self, surface: Surface, forms: Tuple[Any, ...], previous_forms: Tuple[Any, ...]) -> List[Rect]:
+        dirty_rects: List[Rect] = []
+        artist_surfaces = self._artist_surfaces(surface)
+        for child_surface, child, form, previous_form in zip(
+                artist_surfaces[1:], self._children, forms[1:], previous_forms[1:]
+        ):
+            if child.is_dirty or self._form_changed(previous_form, form):
+                dirty_rects.extend(child.draw(child_surface, form, self))
+
+        if dirty_rects and self._foreground:
+            self._foreground.redraw(artist_surfaces[-1], forms[-1], self, dirty_rects)
+
+        return dirty_rects
+
+    def _draw_cached(self, surface: Surface, state: State) -> List[Rect]:
+        texture, created = self.texture_cache.texture(self, surface.get_size())
+        if created:
+            self._dirty = True
+
+        texture_rects = self._draw(texture, state)
+        offset = surface.get_abs_offset()
+        if self._exposed or created:
+            self._exposed = False
+            surface.blit(texture, self._origin)
+            return [texture.get_rect().move(offset)]
+
+        for rect in texture_rects:
+            surface.blit(texture, rect.topleft, rect)
+
+        return [rect.move(offset) for rect in texture_rects]
+
+    def draw(self, surface, state: State, component=None) -> List[Rect]:
+        return self._draw_cached(surface, state) if self._cached else self._draw(surface, state)
+
+    def _draw(self, surface: Surface, state: State) -> List[Rect]:
+        if self._needs_layout(surface):
+            self.settle_layout(surface)
+
+        forms = (
+            self._background.bind_template(state, self),
+            *self.bind_children(state),
+            *((self.bind_foreground(state),) if self._foreground else ())
+        )
+        if self._layout_dirty:
+            self._relayout(surface)
+
+        previous_forms, self._forms = self._forms, forms
+        dirty_rects = (
+            self._draw_all(surface, forms) if (
+                self._dirty or
+                self._form_changed(previous_forms[0], forms[0]) or
+                (self._foreground and self._form_changed(previous_forms[-1], forms[-1]))
+            ) else
+            self._draw_changed(surface, forms, previous_forms)
+        )
+        if self._layout_dirty:
+            self._relayout(surface)
+            full_rect, = self._draw_all(surface, forms)
+            dirty_rects = [rect for rect in dirty_rects if not full_rect.contains(rect)]
+            dirty_rects.append(full_rect)
+
+        self._dirty = self._dirty_descendants = False
+        if self._layout_dirty:
+            self.invalidate()
+
+        return dirty_rects
+
+    def child_at(self, x: int, y: int) -> Optional[Tuple[Component, int, int]]:
+        if self._hit_index is None:
+            self._hit_index = GridIndex(self._current_artist_subsurfaces[1:len(self._children) + 1])
+
+        ordinal = self._hit_index.query(x, y)
+        if ordinal is None:
+            return None
+
+        left, top, _, _ = self._hit_index.rects[ordinal]
+        return self._children[ordinal], x - left, y - top
+
+    def hit_path(self, x: int, y: int) -> Tuple[Tuple[Component, int, int], ...]:
+        path = [(self, x, y)]
+        hit = self.child_at(x, y)
+        while hit:
+            path.append(hit)
+            component, x, y = hit
+            hit = component.child_at(x, y)
+
+        return tuple(path)
 
     def on_click(self, x: int, y: int):
-        for child_surface, child in zip(self._current_artist_subsurfaces, self._children):
-            left, top, right, bottom = child_surface
-            if left <= x <= right and bottom <= y <= top:
-                return child.on_click(x - left, y - top)
+        hit = self.child_at(x, y)
+        if hit:
+            child, child_x, child_y = hit
+            return child.on_click(child_x, child_y)
+
+    def on_hover(self, x: int, y: int):
+        pass
+
+    def on_enter(self):
+        pass
+
+    def on_leave(self):
+        pass
+
+    def on_drop(self, source: Component, x: int, y: int) -> bool:
+        return False
+
+    def on_key(self, event) -> bool:
+        return False
+
+    def on_scroll(self, x: int, y: int) -> bool:
+        return False
 
 
 Children = Tuple[
@@ -99,7 +412,8 @@ ComponentState = Tuple[
     Artist,
     Foreground,
     Children,
-    Layout
+    Layout,
+    bool
 ]
 
 __all__ = ['Component']
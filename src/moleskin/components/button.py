@@ -17,31 +17,44 @@ ButtonForm = Tuple[
 ]
 
 
-class ButtonBackgroundTemplate(FixedFormTemplate[ButtonForm]):
+class ButtonBackgroundTemplate(FixedFormTemplate[ButtonForm], interned=True):
+    __slots__ = ('_initial_color', '_pressed_color')
+
     def __init__(self, initial_color: Union[str, Color], pressed_color: Union[str, Color]):
         self._initial_color, self._pressed_color = initial_color, pressed_color
         super().__init__(self._initial_color, self._pressed_color)
 
 
 class ButtonBackground(Artist[State, SelectedState, ButtonForm]):
-    def draw(self, surface, form: ButtonForm, button: Button):
+    __slots__ = ()
+
+    def solid_fill(self, form: ButtonForm, button: Button):
         initial_color, pressed_color = form
-        surface.fill(pressed_color if button.is_pressed else initial_color)
+        return pressed_color if button.is_pressed else initial_color
+
+    def draw(self, surface, form: ButtonForm, button: Button):
+        surface.fill(self.solid_fill(form, button))
 
 
 class Button(Component, ABC):
+    __slots__ = ('_is_pressed',)
+
     def __init__(
             self,
             template,
             background: ButtonBackgroundTemplate,
             foreground
     ):
-        super().__init__(template, background, foreground, ())
+        super().__init__(template, ButtonBackground(background), foreground, ())
         self._is_pressed = False
 
+    def __getstate__(self):
+        return self._template, self._background.template, self._foreground
+
     @property
     def is_pressed(self):
         return self._is_pressed
 
     def on_click(self, x, y):
         self._is_pressed = True
+        self.invalidate()
@@ -1,29 +1,184 @@
 from abc import ABC, abstractmethod
-from typing import Callable, Generic
+from contextlib import nullcontext
+from typing import Generic, List, Optional, Dict
+import pygame
 from pygame import Surface
+from pygame.event import Event
 from moleskin.component import Component
+from moleskin.performance.display_list import DisplayList
+from moleskin.pointer import Pointer
+from moleskin.scheduler import Scheduler
+from moleskin.startup import RENDER, trace
 from moleskin.state import State, SelectedState
 from moleskin.template import Form
 
 
 class Frame(ABC, Generic[State, SelectedState, Form]):
-    def __init__(self, root: Component[State, SelectedState, Form]):
+    _idle_timeout = 250
+    _resize_events = (pygame.VIDEORESIZE, pygame.WINDOWRESIZED, pygame.WINDOWSIZECHANGED)
+    _coalesced_events = (pygame.MOUSEMOTION, *_resize_events)
+
+    @classmethod
+    def _coalesce(cls, events: List[Event]) -> List[Event]:
+        coalesced: List[Optional[Event]] = []
+        latest: Dict[int, int] = {}
+        for event in events:
+            if event.type in cls._coalesced_events:
+                try:
+                    ordinal = latest[event.type]
+                except KeyError:
+                    pass
+                else:
+                    if event.type == pygame.MOUSEMOTION:
+                        (x, y), (previous_x, previous_y) = event.rel, coalesced[ordinal].rel
+                        event = Event(event.type, {**event.dict, 'rel': (previous_x + x, previous_y + y)})
+
+                    coalesced[ordinal] = None
+
+                latest[event.type] = len(coalesced)
+            else:
+                latest.clear()
+
+            coalesced.append(event)
+
+        return [event for event in coalesced if event is not None]
+
+    def __init__(
+            self,
+            root: Component[State, SelectedState, Form],
+            idle: bool = False,
+            scheduler: Optional[Scheduler] = None,
+            compiled: bool = False
+    ):
         self._root = root
+        self._pointer = Pointer(root)
+        self._focus: Optional[Component] = None
+        self._idle = idle
+        self._scheduler = scheduler or Scheduler()
+        self._display_list = DisplayList(root) if compiled else None
+        self._rendered = False
 
     @property
     def root(self):
         return self._root
 
+    @property
+    def pointer(self):
+        return self._pointer
+
+    @property
+    def focus(self):
+        return self._focus
+
+    @focus.setter
+    def focus(self, component: Optional[Component]):
+        self._focus = component
+
+    @property
+    def scheduler(self):
+        return self._scheduler
+
+    @property
+    def alpha(self):
+        return self._scheduler.alpha
+
+    @property
+    def idle(self):
+        return self._idle
+
+    @idle.setter
+    def idle(self, idle: bool):
+        self._idle = idle
+
+    def events(self) -> List[Event]:
+        events = pygame.event.get()
+        if not events and self._idle and not self._root.is_dirty:
+            with self._scheduler.idle():
+                event = pygame.event.wait(self._idle_timeout)
+
+            events = [event, *pygame.event.get()] if event.type != pygame.NOEVENT else []
+
+        return self._coalesce(events)
+
+    def _dispatch_key(self, event: Event) -> bool:
+        component = self._focus or self._root
+        while component and not component.on_key(event):
+            component = component.parent
+
+        return component is not None
+
+    def _dispatch_scroll(self, event: Event) -> bool:
+        component = self._pointer.hovered or self._root
+        while component and not component.on_scroll(event.x, event.y):
+            component = component.parent
+
+        return component is not None
+
+    def dispatch(self, event: Event) -> bool:
+        if event.type == pygame.QUIT:
+            return False
+
+        if event.type == pygame.MOUSEMOTION:
+            self._pointer.move(*event.pos)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
+            self._pointer.press(*event.pos)
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == pygame.BUTTON_LEFT:
+            self._pointer.release(*event.pos)
+        elif event.type == pygame.MOUSEWHEEL:
+            self._dispatch_scroll(event)
+        elif event.type in (pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT):
+            self._dispatch_key(event)
+        elif event.type in self._resize_events:
+            self._root.invalidate_layout()
+
+        return self.on_event(event)
+
+    def on_event(self, event: Event) -> bool:
+        return True
+
+    def render(self, screen: Surface):
+        with nullcontext() if self._rendered else trace.span(RENDER, 'first frame'):
+            dirty_rects = (
+                self._display_list.execute(screen, self.state) if self._display_list else
+                self._root.draw(screen, self.state)
+            )
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+
+        self._rendered = True
+
+    def tick(self, screen: Surface) -> bool:
+        events = self.events()
+        updates = self._scheduler.begin_frame()
+        Component.apply_pending_invalidations()
+        for event in events:
+            if not self.dispatch(event):
+                return False
+
+        for _ in range(updates):
+            self.update(self._scheduler.timestep)
+
+        if not self.draw(screen):
+            return False
+
+        if self._scheduler.should_render():
+            self.render(screen)
+
+        self._scheduler.end_frame()
+        return True
+
     def loop(self, screen: Surface):
-        while self.draw(screen):
-            self._root.draw(screen, self.state)
+        while self.tick(screen):
+            pass
 
-    @abstractmethod
-    def draw(self, screen: Surface) -> bool:
+    def update(self, timestep: float):
         pass
 
-    @abstractmethod
+    def draw(self, screen: Surface) -> bool:
+        return True
+
     @property
+    @abstractmethod
     def state(self) -> State:
         pass
 
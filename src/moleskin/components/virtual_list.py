@@ -0,0 +1,149 @@
+from typing import Any, Callable, Optional, Tuple, Union
+from pygame import Color, Rect, Surface
+from moleskin.artist import Artist
+from moleskin.backgrounds.color import BackgroundColor, BackgroundColorForm
+from moleskin.component import Component, Children
+from moleskin.layout import Size
+from moleskin.state import State
+from moleskin.template import Template
+
+ItemSource = Callable[[int], Any]
+RowFactory = Callable[[], Component]
+
+
+class VirtualList(Component):
+    __slots__ = (
+        '_source', '_count', '_factory', '_item_size', '_viewport', '_columns', '_visible_rows', '_first_row'
+    )
+
+    def __init__(
+            self,
+            background: Union[str, Color, BackgroundColorForm, BackgroundColor, Template, Artist],
+            source: ItemSource,
+            count: int,
+            factory: RowFactory,
+            item_size: Size,
+            viewport: Size,
+            columns: int = 1,
+            template: Optional[Template] = None
+    ):
+        _, item_height = item_size
+        _, viewport_height = viewport
+        self._source, self._count, self._factory = source, count, factory
+        self._item_size, self._viewport, self._columns = item_size, viewport, columns
+        self._visible_rows = max(1, -(-viewport_height // item_height))
+        self._first_row = 0
+        super().__init__(template, background, None, self._pool(()), None)
+        self._current_size = viewport
+
+    def __getstate__(self):
+        return (
+            self._background, self._source, self._count, self._factory,
+            self._item_size, self._viewport, self._columns, self._template
+        )
+
+    def _pool(self, rows: Children) -> Children:
+        pool_size = min(self._visible_rows * self._columns, self._count)
+        return (*rows[:pool_size], *(self._factory() for _ in range(pool_size - len(rows))))
+
+    def _set_pool(self, rows: Children):
+        self._children = rows
+        self._artists = (self._background, *rows, *((self._foreground,) if self._foreground else ()))
+        self._forms = ()
+        for row in rows:
+            row._parent = self
+
+        self.invalidate_layout()
+
+    def _visible_count(self) -> int:
+        return max(0, min(len(self._children), self._count - self._first_row * self._columns))
+
+    def _organized_artists(self, screen: Surface) -> Tuple[
+        Size,
+        Tuple[Rect, ...]
+    ]:
+        item_width, item_height = self._item_size
+        bounds = screen.get_rect()
+        viewport_rect = self._clip(Rect(self._origin, self._viewport), bounds)
+        visible_count = self._visible_count()
+        return self._viewport, (
+            viewport_rect,
+            *(
+                self._clip(Rect(
+                    slot % self._columns * item_width, slot // self._columns * item_height, item_width, item_height
+                ), bounds) if slot < visible_count else
+                Rect(0, 0, 0, 0)
+                for slot in range(len(self._children))
+            ),
+            viewport_rect
+        )
+
+    @property
+    def count(self):
+        return self._count
+
+    @count.setter
+    def count(self, count: int):
+        self._count = count
+        self._first_row = min(self._first_row, self.max_first_row)
+        rows = self._pool(self._children)
+        if len(rows) != len(self._children):
+            self._set_pool(rows)
+        else:
+            self.invalidate_layout()
+
+    @property
+    def columns(self):
+        return self._columns
+
+    @property
+    def first_row(self):
+        return self._first_row
+
+    @property
+    def max_first_row(self):
+        return max(0, -(-self._count // self._columns) - self._visible_rows)
+
+    @property
+    def visible_range(self) -> range:
+        first = self._first_row * self._columns
+        return range(first, first + self._visible_count())
+
+    def item_index(self, row: Component) -> Optional[int]:
+        try:
+            slot = self._children.index(row)
+        except ValueError:
+            return None
+
+        return self._first_row * self._columns + slot if slot < self._visible_count() else None
+
+    def scroll_to(self, row: int):
+        row = max(0, min(row, self.max_first_row))
+        if row == self._first_row:
+            return
+
+        visible_count = self._visible_count()
+        self._first_row = row
+        if self._visible_count() != visible_count:
+            self.invalidate_layout()
+        else:
+            self.invalidate()
+
+    def scroll_by(self, rows: int):
+        self.scroll_to(self._first_row + rows)
+
+    def _child_resized(self, child: Component):
+        pass
+
+    def bind_children(self, state: State) -> Tuple[Any, ...]:
+        first, last = self._first_row * self._columns, self._count - 1
+        return tuple(
+            row.bind_template(self._source(min(first + slot, last)), self) for slot, row in enumerate(self._children)
+        )
+
+    def on_scroll(self, x: int, y: int) -> bool:
+        self.scroll_by(-y)
+        return True
+
+
+__all__ = ['VirtualList']
@@ -1,36 +1,84 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Tuple, Union, Dict, cast
-import pygame.font
-from pygame import Color, Surface
+from os import getenv
+from typing import Iterable, Tuple, Union, Optional, cast
+from pygame import Color, Surface, Rect
 from pygame.font import Font
 from moleskin.artist import Artist
+from moleskin.performance.fonts import FontCache, FontSpec
+from moleskin.performance.glyphs import GlyphCache
+from moleskin.performance.text import TextCache
+from moleskin.startup import lazy_assets
+from moleskin.state import State, SelectedState
 from moleskin.template import FixedFormTemplate
 
 Text = str
 Antialias = bool
 
 
+class _Stateless:
+    def __eq__(self, other):
+        return type(self) is type(other)
+
+    def __hash__(self):
+        return hash(type(self))
+
+
+class TextRenderer(ABC):
+    @abstractmethod
+    def text_size(self, font: Font, text: str) -> Tuple[int, int]:
+        pass
+
+    @abstractmethod
+    def draw(
+            self,
+            surface: Surface,
+            position: Tuple[int, int],
+            font: Font,
+            text: str,
+            antialias: bool,
+            color: Color,
+            bg_color: Optional[Color]
+    ) -> Rect:
+        pass
+
+
+class SurfaceTextRenderer(_Stateless, TextRenderer):
+    def text_size(self, font, text):
+        return ForegroundTemplate.text_cache.text_size(font, text)
+
+    def draw(self, surface, position, font, text, antialias, color, bg_color):
+        return surface.blit(ForegroundTemplate.text_cache.render(font, text, antialias, color, bg_color), position)
+
+
+class GlyphTextRenderer(_Stateless, TextRenderer):
+    def text_size(self, font, text):
+        return ForegroundTemplate.glyph_cache.text_size(font, text)
+
+    def draw(self, surface, position, font, text, antialias, color, bg_color):
+        return ForegroundTemplate.glyph_cache.draw(surface, position, font, text, antialias, color, bg_color)
+
+
 class Alignment(ABC):
     @abstractmethod
-    def offset(self, surface: Surface, text: str, font: Font) -> int:
+    def offset(self, surface: Surface, text: str, font: Font, renderer: Optional[TextRenderer] = None) -> int:
         pass
 
 
-class LeftAlignment(Alignment):
-    def offset(self, surface, text, font):
+class LeftAlignment(_Stateless, Alignment):
+    def offset(self, surface, text, font, renderer=None):
         return 0
 
 
-class CenterAlignment(Alignment):
-    def offset(self, surface, text, font):
-        width, _ = font.size(text)
+class CenterAlignment(_Stateless, Alignment):
+    def offset(self, surface, text, font, renderer=None):
+        width, _ = (renderer or ForegroundTemplate.default_renderer).text_size(font, text)
         return -width // 2
 
 
-class RightAlignment(Alignment):
-    def offset(self, surface, text, font):
-        width, _ = font.size(text)
+class RightAlignment(_Stateless, Alignment):
+    def offset(self, surface, text, font, renderer=None):
+        width, _ = (renderer or ForegroundTemplate.default_renderer).text_size(font, text)
         return -width
 
 
@@ -40,38 +88,72 @@ ForegroundForm = Tuple[
     Antialias,
     Color,
     Color,
-    Alignment
+    Alignment,
+    TextRenderer
 ]
 
 
-class ForegroundTemplate(FixedFormTemplate[ForegroundForm]):
-    _font_cache: Dict[str, Font] = {}
+class ForegroundTemplate(FixedFormTemplate[ForegroundForm], interned=True):
+    __slots__ = (
+        '_font_spec', '_font', '_text', '_antialias', '_color', '_bg_color', '_alignment', '_renderer'
+    )
+    _text_cache_size_varname = 'GAME_TEXT_CACHE_SIZE'
+    _glyph_cache_size_varname = 'GAME_GLYPH_CACHE_SIZE'
+    _font_cache_size_varname = 'GAME_FONT_CACHE_SIZE'
+    _font_index_varname = 'GAME_FONT_INDEX'
+    text_cache = TextCache(getenv(_text_cache_size_varname, '16mib'))
+    glyph_cache = GlyphCache(getenv(_glyph_cache_size_varname, '8mib'))
+    font_cache = FontCache(getenv(_font_cache_size_varname, '64'), getenv(_font_index_varname))
+    default_renderer: TextRenderer = SurfaceTextRenderer()
 
     @classmethod
-    def _resolve_font(cls, name: str, size: int):
-        try:
-            font = cls._font_cache[name]
-        except KeyError:
-            font = cls._font_cache[name] = pygame.font.SysFont(name, size)
-
-        return font
+    def _resolve_font(cls, name: str, size: int, bold: bool = False, italic: bool = False):
+        return cls.font_cache.font(name, size, bold, italic)
 
     def __init__(
             self,
-            font: Union[Tuple[str, float], Font],
+            font: Union[FontSpec, Font],
             text: str,
             antialias: bool,
             color: Color,
             bg_color: Color,
-            alignment: Alignment
+            alignment: Alignment,
+            renderer: Optional[TextRenderer] = None
     ):
-        self._font, self._text, self._antialias, self._color, self._bg_color, self._alignment = (
-            font if isinstance(font, Font) else self._resolve_font(*font), text, antialias, color, bg_color, alignment
+        self._font_spec = font
+        self._font: Optional[Font] = font if isinstance(font, Font) else None
+        self._text, self._antialias, self._color, self._bg_color, self._alignment, self._renderer = (
+            text, antialias, color, bg_color, alignment, renderer or self.default_renderer
+        )
+        self._form = None
+        if self._font or not lazy_assets():
+            self._hydrate()
+
+    def _hydrate(self):
+        if self._font is None:
+            self._font = self._resolve_font(*self._font_spec)
+
+        super().__init__(
+            self._font, self._text, self._antialias, self._color, self._bg_color, self._alignment, self._renderer
         )
-        super().__init__(self._font, self._text, self._antialias, self._color, self._bg_color, self._alignment)
+
+    def __getstate__(self):
+        return (
+            self._font or self._font_spec, self._text, self._antialias, self._color, self._bg_color, self._alignment,
+            self._renderer
+        )
+
+    def bind(self, _, __):
+        if self._form is None:
+            self._hydrate()
+
+        return self._form
 
     @property
     def font(self):
+        if self._font is None:
+            self._hydrate()
+
         return self._font
 
     @property
@@ -94,8 +176,14 @@ class ForegroundTemplate(FixedFormTemplate[ForegroundForm]):
     def alignment(self):
         return self._alignment
 
+    @property
+    def renderer(self):
+        return self._renderer
+
 
 class Foreground(Artist[State, SelectedState, ForegroundForm]):
+    __slots__ = ()
+
     def __init__(
             self,
             template: Union[ForegroundForm, ForegroundTemplate]
@@ -105,11 +193,32 @@ class Foreground(Artist[State, SelectedState, ForegroundForm]):
 
     @property
     def size(self):
-        return self._template.font.size(self._template.text)
+        return self._template.renderer.text_size(self._template.font, self._template.text)
+
+    @staticmethod
+    def form_size(form: ForegroundForm) -> Tuple[int, int]:
+        font, text, _, _, _, _, renderer = form
+        return renderer.text_size(font, text)
 
     def draw(self, surface, form: ForegroundForm, component):
-        font, text, antialias, color, bg_color, alignment = form
-        surface.blit(font.render(text, antialias, color, bg_color), (alignment.offset(surface, text, font), 0))
+        font, text, antialias, color, bg_color, alignment, renderer = form
+        renderer.draw(
+            surface, (alignment.offset(surface, text, font, renderer), 0), font, text, antialias, color, bg_color
+        )
+
+    def redraw(self, surface: Surface, form: ForegroundForm, component, rects: Iterable[Rect]):
+        clip = surface.get_clip()
+        x, y = surface.get_abs_offset()
+        bounds = surface.get_rect().move(x, y)
+        for rect in rects:
+            if bounds.colliderect(rect):
+                surface.set_clip(rect.move(-x, -y))
+                self.draw(surface, form, component)
 
+        surface.set_clip(clip)
 
-__all__ = ['LeftAlignment', 'CenterAlignment', 'RightAlignment', 'ForegroundForm', 'ForegroundTemplate', 'Foreground']
+
+__all__ = [
+    'TextRenderer', 'SurfaceTextRenderer', 'GlyphTextRenderer',
+    'LeftAlignment', 'CenterAlignment', 'RightAlignment', 'ForegroundForm', 'ForegroundTemplate', 'Foreground'
+]
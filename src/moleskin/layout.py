@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Tuple
 
 from pygame import Surface
+from moleskin.performance.lru import LRUCache
 
 Size = Tuple[
     int,
@@ -23,10 +24,30 @@ Arrangement = Tuple[
 ]
 
 
+ArrangementKey = Tuple[
+    Size,
+    Sizes
+]
+
+
 class Layout(ABC):
+    _arrangement_cache_size = '64kib'
+    _arrangements: LRUCache[ArrangementKey, Arrangement] = None
+
     @abstractmethod
     def arrange(self, surface: Surface, child_sizes: Sizes) -> Arrangement:
         pass
 
+    def __getstate__(self):
+        return {name: value for name, value in self.__dict__.items() if name != '_arrangements'}
+
+    def arrangement(self, surface: Surface, child_sizes: Sizes) -> Arrangement:
+        if self._arrangements is None:
+            self._arrangements = LRUCache(self._arrangement_cache_size)
+
+        key = surface.get_size(), child_sizes
+        arrangement = self._arrangements.get(key)
+        return self._arrangements.put(key, self.arrange(surface, child_sizes)) if arrangement is None else arrangement
+
 
-__all__ = ['Size', 'Sizes', 'Position', 'Positions', 'Layout']
+__all__ = ['Size', 'Sizes', 'Position', 'Positions', 'Arrangement', 'Layout']
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from itertools import accumulate
-from typing import Dict, List
-from moleskin.layout import Layout, Size
+from typing import Dict
+from moleskin.layout import Layout
 
 
 class GridLayout(Layout):
@@ -34,6 +34,9 @@ class GridLayout(Layout):
         self._columns = columns
         self._rows = rows
 
+    def __getnewargs__(self):
+        return self._columns, self._rows
+
     @property
     def columns(self):
         return self._columns
@@ -47,23 +50,25 @@ class GridLayout(Layout):
         return self._rows, self._columns
 
     def arrange(self, surface, child_sizes):
-        rows: List[List[Size]] = [[] for _ in range(self._rows)]
-        cols: List[List[Size]] = [[] for _ in range(self._columns)]
-        for ordinal, size in enumerate(child_sizes[:self._columns * self._rows]):
-            rows[ordinal // self._columns].append(size)
-            cols[ordinal // self._rows].append(size)
-
-        row_sizes: List[Size] = [(sum(width for width, _ in row), max(height for _, height in row)) for row in rows]
-        col_sizes: List[Size] = [(max(width for width, _ in col), sum(height for _, height in col)) for col in cols]
+        if len(child_sizes) > self._columns * self._rows:
+            raise UserWarning(
+                f"{self._columns}x{self._rows} grid layout cannot arrange {len(child_sizes)} children"
+            )
 
-        row_offsets = list(accumulate((height for _, height in row_sizes), initial=0))
-        col_offsets = list(accumulate((width for width, _ in col_sizes), initial=0))
+        col_offsets = tuple(accumulate((
+            max((width for width, _ in child_sizes[column::self._columns]), default=0)
+            for column in range(self._columns)
+        ), initial=0))
+        row_offsets = tuple(accumulate((
+            max((height for _, height in child_sizes[row * self._columns:(row + 1) * self._columns]), default=0)
+            for row in range(self._rows)
+        ), initial=0))
 
         return (
-            (sum(width for width, _ in col_sizes), sum(height for _, height in row_sizes)),
+            (col_offsets[-1], row_offsets[-1]),
             tuple(
-                (row_offsets[ordinal // self._columns], col_offsets[ordinal // self._rows])
-                for ordinal, _ in enumerate(child_sizes)
+                (col_offsets[ordinal % self._columns], row_offsets[ordinal // self._columns])
+                for ordinal in range(len(child_sizes))
             )
         )
 
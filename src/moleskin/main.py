@@ -8,16 +8,17 @@ TestForm = Tuple
 
 
 class TestFrame(Frame[TestState, TestSelectedState, TestForm]):
-    def draw(self, screen):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
+    def on_event(self, event):
+        # write your pygame event code here
+
+        return True
 
-        # write your pygame event and graphics code here
+    def draw(self, screen):
+        # write your per-frame graphics code here
 
-        pygame.display.flip()
         return True
 
+    @property
     def state(self):
         return ()
 
@@ -0,0 +1,142 @@
+import json
+import mmap
+import struct
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Union, Dict, Iterable, NamedTuple, Tuple, BinaryIO, TYPE_CHECKING
+import pygame
+from pygame import Surface
+from moleskin.performance.surfaces import SurfaceCache, SupportedImageFormat
+from moleskin.startup import load_module
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+Region = Dict[str, Union[int, str, Tuple[int, int]]]
+
+
+class AtlasRegion(NamedTuple):
+    atlas: str
+    name: str
+
+
+class TextureAtlas:
+    _magic = b'MSKA'
+    _version = 1
+    _header = struct.Struct('<4sHHI')
+    _alignment = 16
+    _image_suffixes = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tga', '.webp')
+    _atlases: Dict[str, 'TextureAtlas'] = {}
+
+    @classmethod
+    def _align(cls, offset: int):
+        return -(-offset // cls._alignment) * cls._alignment
+
+    @classmethod
+    def _write_padding(cls, fp: BinaryIO):
+        fp.write(bytes(cls._align(fp.tell()) - fp.tell()))
+
+    @classmethod
+    def pack(cls, directory: Union[str, Path], output: Union[str, Path], suffixes: Iterable[str] = None):
+        directory = Path(directory)
+        suffixes = tuple(suffixes or cls._image_suffixes)
+        paths = sorted(path for path in directory.rglob('*') if path.is_file() and path.suffix.lower() in suffixes)
+
+        pil_image = load_module('PIL.Image')
+        images: Dict[str, Tuple[SupportedImageFormat, 'Image.Image']] = {}
+        for path in paths:
+            with pil_image.open(path) as image:
+                image_format = SurfaceCache.image_format(image)
+                images[path.relative_to(directory).as_posix()] = image_format, image.convert(image_format)
+
+        offset = 0
+        regions: Dict[str, Region] = {}
+        for name, (image_format, image) in images.items():
+            regions[name] = {'offset': offset, 'size': image.size, 'format': image_format}
+            offset = cls._align(offset + image.width * image.height * len(image_format))
+
+        index = json.dumps({'regions': regions}, separators=(',', ':')).encode()
+        with open(output, 'wb') as fp:
+            fp.write(cls._header.pack(cls._magic, cls._version, 0, len(index)))
+            fp.write(index)
+            cls._write_padding(fp)
+            data_offset = fp.tell()
+            for name, (_, image) in images.items():
+                fp.seek(data_offset + regions[name]['offset'])
+                fp.write(image.tobytes())
+
+            cls._write_padding(fp)
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'TextureAtlas':
+        key = str(Path(path).resolve())
+        try:
+            atlas = cls._atlases[key]
+        except KeyError:
+            atlas = cls._atlases[key] = cls(key)
+
+        return atlas
+
+    def __init__(self, path: Union[str, Path]):
+        self._path = str(path)
+        with open(self._path, 'rb') as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, version, _, index_length = self._header.unpack_from(self._mmap)
+        if magic != self._magic or version != self._version:
+            raise ValueError(f"'{self._path}' is not a version {self._version} texture atlas")
+
+        index_offset = self._header.size
+        self._regions: Dict[str, Region] = json.loads(
+            self._mmap[index_offset:index_offset + index_length]
+        )['regions']
+        self._data_offset = self._align(index_offset + index_length)
+        self._surfaces: Dict[str, Surface] = {}
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def names(self):
+        return tuple(self._regions)
+
+    def __contains__(self, name: str):
+        return name in self._regions
+
+    def __getitem__(self, name: str) -> Surface:
+        try:
+            surface = self._surfaces[name]
+        except KeyError:
+            try:
+                region = self._regions[name]
+            except KeyError as ex:
+                raise KeyError(f"no region '{name}' in texture atlas '{self._path}'") from ex
+
+            width, height = region['size']
+            offset = self._data_offset + region['offset']
+            surface = self._surfaces[name] = pygame.image.frombuffer(
+                memoryview(self._mmap)[offset:offset + width * height * len(region['format'])],
+                (width, height),
+                region['format']
+            )
+
+        return surface
+
+    def region(self, name: str):
+        return AtlasRegion(self._path, name)
+
+
+def main():
+    parser = ArgumentParser(description="bake a directory of images into a moleskin texture atlas")
+    parser.add_argument('directory')
+    parser.add_argument('output')
+    args = parser.parse_args()
+    TextureAtlas.pack(args.directory, args.output)
+
+
+if __name__ == '__main__':
+    main()
+
+
+__all__ = ['AtlasRegion', 'TextureAtlas']
@@ -0,0 +1,247 @@
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from math import ceil, sqrt
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict, List, Sequence, Tuple, Callable, Optional, Any, Union
+import pygame
+from pygame import Color, Surface
+from PIL import Image
+from moleskin.backgrounds.color import BackgroundColor, BackgroundColorTemplate
+from moleskin.backgrounds.image import BackgroundImage, BackgroundImageTemplate
+from moleskin.component import Component
+from moleskin.components.button import Button, ButtonBackgroundTemplate
+from moleskin.layouts.full import FullLayout
+from moleskin.layouts.grid import GridLayout
+from moleskin.scheduler import percentile
+
+Scenario = Callable[[Component, Sequence[Component], Random], None]
+BenchmarkResult = Dict[str, Any]
+
+
+def _static(root, leaves, random):
+    pass
+
+
+def _leaf(root, leaves, random):
+    random.choice(leaves).invalidate()
+
+
+def _full(root, leaves, random):
+    root.invalidate()
+
+
+scenarios: Dict[str, Scenario] = {
+    'static': _static,
+    'leaf': _leaf,
+    'full': _full
+}
+
+
+def _summary(values: Sequence[float]) -> Dict[str, float]:
+    sorted_values = sorted(values)
+    return {
+        'mean': sum(sorted_values) / len(sorted_values),
+        'p50': percentile(sorted_values, 50),
+        'p99': percentile(sorted_values, 99),
+        'max': sorted_values[-1]
+    }
+
+
+def build_tree(depth: int, fanout: int, image_path: Union[str, Path]) -> Tuple[Component, Tuple[Component, ...]]:
+    columns = ceil(sqrt(fanout))
+    layout = GridLayout(columns, ceil(fanout / columns))
+    image = BackgroundImageTemplate(image_path)
+    image.wait_loaded()
+    leaves: List[Component] = []
+
+    def node(level: int, ordinal: int) -> Component:
+        if level < depth:
+            return Component(
+                None,
+                BackgroundColor(BackgroundColorTemplate(Color(0x10 * level, 0x20, 0x40))),
+                None,
+                tuple(node(level + 1, child_ordinal) for child_ordinal in range(fanout)),
+                layout
+            )
+
+        kind = ordinal % 3
+        leaf = (
+            Button(None, ButtonBackgroundTemplate(Color(0x80, 0x80, 0x80), Color(0xff, 0xff, 0xff)), 'button')
+            if kind == 0 else
+            Component(None, BackgroundImage(image), f'image {ordinal}')
+            if kind == 1 else
+            Component(None, Color(0xff, 0xff, 0xff), f'label {ordinal}')
+        )
+        leaves.append(leaf)
+        return leaf
+
+    return Component(None, Color(0, 0, 0), None, (node(1, 0),), FullLayout()), tuple(leaves)
+
+
+def _draw(root: Component, screen: Surface):
+    dirty_rects = root.draw(screen, ())
+    if dirty_rects:
+        pygame.display.update(dirty_rects)
+
+
+def run_scenario(
+        scenario: str,
+        screen: Surface,
+        depth: int,
+        fanout: int,
+        frames: int,
+        image_path: Union[str, Path],
+        seed: int = 0
+) -> BenchmarkResult:
+    root, leaves = build_tree(depth, fanout, image_path)
+    update = scenarios[scenario]
+    random = Random(seed)
+    _draw(root, screen)
+
+    frame_times: List[float] = []
+    for _ in range(frames):
+        update(root, leaves, random)
+        start = perf_counter()
+        _draw(root, screen)
+        frame_times.append(perf_counter() - start)
+
+    random.seed(seed)
+    gc_collections = sum(stats['collections'] for stats in gc.get_stats())
+    allocated_blocks: List[int] = []
+    peak_bytes: List[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(frames):
+            update(root, leaves, random)
+            blocks = sys.getallocatedblocks()
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            _draw(root, screen)
+            _, peak = tracemalloc.get_traced_memory()
+            allocated_blocks.append(sys.getallocatedblocks() - blocks)
+            peak_bytes.append(peak - current)
+    finally:
+        tracemalloc.stop()
+
+    total_time = sum(frame_times)
+    return {
+        'scenario': scenario,
+        'depth': depth,
+        'fanout': fanout,
+        'components': 1 + sum(fanout ** level for level in range(depth)),
+        'frames': frames,
+        'fps': frames / total_time if total_time else float('inf'),
+        'frame_time_ms': {key: value * 1000 for key, value in _summary(frame_times).items()},
+        'allocated_blocks_per_frame': _summary(allocated_blocks),
+        'peak_allocated_bytes_per_frame': _summary(peak_bytes),
+        'gc_collections': sum(stats['collections'] for stats in gc.get_stats()) - gc_collections
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', 'HEAD'), capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+        depths: Sequence[int],
+        fanouts: Sequence[int],
+        frames: int,
+        size: Tuple[int, int] = (1280, 720),
+        scenario_names: Sequence[str] = tuple(scenarios)
+) -> Dict[str, Any]:
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode(size)
+        with TemporaryDirectory() as directory:
+            image_path = Path(directory, 'background.png')
+            Image.new('RGB', (64, 64), (0x20, 0x40, 0x80)).save(image_path)
+            results = [
+                run_scenario(scenario, screen, depth, fanout, frames, image_path)
+                for depth in depths
+                for fanout in fanouts
+                for scenario in scenario_names
+            ]
+    finally:
+        pygame.quit()
+
+    return {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'video_driver': os.environ['SDL_VIDEODRIVER'],
+        'screen_size': size,
+        'results': results
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    def key(result: BenchmarkResult):
+        return result['scenario'], result['depth'], result['fanout']
+
+    baseline_results = {key(result): result for result in baseline['results']}
+    lines = []
+    for result in current['results']:
+        try:
+            previous = baseline_results[key(result)]
+        except KeyError:
+            continue
+
+        scenario, depth, fanout = key(result)
+        lines.append(
+            f"{scenario:>8} depth={depth} fanout={fanout}: "
+            f"p50 {previous['frame_time_ms']['p50']:.3f} -> {result['frame_time_ms']['p50']:.3f} ms, "
+            f"p99 {previous['frame_time_ms']['p99']:.3f} -> {result['frame_time_ms']['p99']:.3f} ms, "
+            f"fps {previous['fps']:.1f} -> {result['fps']:.1f}"
+        )
+
+    return lines
+
+
+def main():
+    parser = ArgumentParser(description="headless moleskin rendering benchmarks")
+    parser.add_argument('--depth', type=int, nargs='+', default=(2, 3))
+    parser.add_argument('--fanout', type=int, nargs='+', default=(4, 9))
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--scenario', choices=tuple(scenarios), nargs='+', default=tuple(scenarios))
+    parser.add_argument('--size', type=int, nargs=2, default=(1280, 720))
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--compare', type=Path)
+    args = parser.parse_args()
+
+    report = run(args.depth, args.fanout, args.frames, tuple(args.size), args.scenario)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    if args.compare:
+        print('\n'.join(compare(json.loads(args.compare.read_text()), report)))
+    else:
+        for result in report['results']:
+            print(
+                f"{result['scenario']:>8} depth={result['depth']} fanout={result['fanout']} "
+                f"components={result['components']}: {result['fps']:.1f} fps, "
+                f"p50 {result['frame_time_ms']['p50']:.3f} ms, p99 {result['frame_time_ms']['p99']:.3f} ms, "
+                f"{result['allocated_blocks_per_frame']['mean']:.1f} blocks/frame"
+            )
+
+
+if __name__ == '__main__':
+    main()
+
+
+__all__ = ['scenarios', 'build_tree', 'run_scenario', 'run', 'compare']
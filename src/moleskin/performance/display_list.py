@@ -0,0 +1,221 @@
+from typing import List, Tuple, Any, Optional
+from pygame import Rect, Surface
+from moleskin.component import Component
+from moleskin.layout import Size
+from moleskin.performance.fills import FillBatch
+from moleskin.state import State, unchanged
+
+OpKind = int
+BACKGROUND: OpKind = 0
+FOREGROUND: OpKind = 1
+TEXTURE: OpKind = 2
+
+Op = Tuple[
+    OpKind,
+    int,
+    Surface,
+    Rect
+]
+
+Blit = Tuple[
+    Surface,
+    Tuple[int, int],
+    Rect
+]
+
+
+class DisplayList:
+    _unbound = object()
+
+    def __init__(self, root: Component):
+        self._root = root
+        self._screen: Optional[Surface] = None
+        self._screen_size: Optional[Size] = None
+        self._ops: List[Op] = []
+        self._components: List[Component] = []
+        self._parents: List[int] = []
+        self._slots: List[int] = []
+        self._ends: List[int] = []
+        self._states: List[Any] = []
+        self._child_states: List[Tuple[Any, ...]] = []
+        self._forms: List[Any] = []
+        self._foreground_forms: List[Any] = []
+        self._marks: List[int] = []
+        self._fills = FillBatch()
+        self._blits: List[Blit] = []
+        self._blit_rects: List[Rect] = []
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def fills(self):
+        return self._fills
+
+    def __len__(self):
+        return len(self._ops)
+
+    def is_stale(self, screen: Surface):
+        return (
+            self._root.layout_changed or
+            self._screen is not screen or
+            self._screen_size != screen.get_size()
+        )
+
+    def _compile(self, component: Component, parent: int, slot: int, surface: Surface):
+        ordinal = len(self._components)
+        component.mark_layout_seen()
+        self._components.append(component)
+        self._parents.append(parent)
+        self._slots.append(slot)
+        self._ends.append(0)
+        if component.cached:
+            self._ops.append((TEXTURE, ordinal, *self._target(surface, surface.get_rect())))
+            self._ends[ordinal] = len(self._ops)
+            return
+
+        background_rect, *child_rects = component.artist_rects
+        foreground_rect = child_rects.pop()
+        self._ops.append((BACKGROUND, ordinal, *self._target(surface, background_rect)))
+        for child_slot, (rect, child) in enumerate(zip(child_rects, component.children)):
+            self._compile(child, ordinal, child_slot, surface.subsurface(rect))
+
+        if component.foreground:
+            self._ops.append((FOREGROUND, ordinal, *self._target(surface, foreground_rect)))
+
+        self._ends[ordinal] = len(self._ops)
+
+    @staticmethod
+    def _target(surface: Surface, rect: Rect) -> Tuple[Surface, Rect]:
+        return surface.subsurface(rect), rect.move(surface.get_abs_offset())
+
+    def compile(self, screen: Surface):
+        self._root.settle_layout(screen)
+        self._ops, self._components, self._parents, self._slots, self._ends = [], [], [], [], []
+        self._compile(self._root, -1, -1, screen)
+        self._states, self._forms, self._foreground_forms = (
+            [self._unbound] * len(self._components) for _ in range(3)
+        )
+        self._child_states = [()] * len(self._components)
+        self._marks = [0] * len(self._components)
+        self._screen = screen
+        self._screen_size = screen.get_size()
+        for component in self._components:
+            component.invalidate()
+
+    def _flush_blits(self, screen: Surface):
+        if self._blits:
+            screen.blits(self._blits, False)
+            self._blits.clear()
+            self._blit_rects.clear()
+
+    def _flush_overlapping(self, screen: Surface, rect: Rect):
+        if rect.collidelist(self._blit_rects) != -1:
+            self._flush_blits(screen)
+
+        if self._fills.intersects(rect):
+            self._fills.flush(screen)
+            self._flush_blits(screen)
+
+    def _flush(self, screen: Surface):
+        self._fills.flush(screen)
+        self._flush_blits(screen)
+
+    def _draw_background(self, screen: Surface, surface: Surface, rect: Rect, background, form, component):
+        color = background.solid_fill(form, component)
+        if color is not None:
+            if rect.collidelist(self._blit_rects) != -1:
+                self._flush_blits(screen)
+
+            self._fills.add(color, rect)
+            return
+
+        source = background.blit_source(surface, form, component)
+        if source is None:
+            self._flush(screen)
+            background.draw(surface, form, component)
+            return
+
+        if self._fills.intersects(rect):
+            self._fills.flush(screen)
+
+        self._blits.append((source, rect.topleft, Rect((0, 0), rect.size)))
+        self._blit_rects.append(rect)
+
+    def execute(self, screen: Surface, state: State) -> List[Rect]:
+        if self.is_stale(screen):
+            self.compile(screen)
+
+        ops, components, parents, slots, ends = self._ops, self._components, self._parents, self._slots, self._ends
+        states, child_states, forms = self._states, self._child_states, self._forms
+        foreground_forms, marks = self._foreground_forms, self._marks
+        dirty_rects: List[Rect] = []
+        forced_until = 0
+        index, op_count = 0, len(ops)
+        while index < op_count:
+            kind, ordinal, surface, rect = ops[index]
+            component = components[ordinal]
+            forced = index < forced_until
+            if kind == FOREGROUND:
+                if forced:
+                    self._flush_overlapping(screen, rect)
+                    component.foreground.draw(surface, foreground_forms[ordinal], component)
+                elif len(dirty_rects) > marks[ordinal]:
+                    self._flush_overlapping(screen, rect)
+                    component.foreground.redraw(
+                        surface, foreground_forms[ordinal], component, dirty_rects[marks[ordinal]:]
+                    )
+
+                index += 1
+                continue
+
+            parent = parents[ordinal]
+            node_state = state if parent < 0 else child_states[parent][slots[ordinal]]
+            previous_state, states[ordinal] = states[ordinal], node_state
+            if not forced and not component.is_dirty and unchanged(previous_state, node_state):
+                index = ends[ordinal]
+                continue
+
+            if kind == TEXTURE:
+                self._flush_overlapping(screen, rect)
+                if forced:
+                    component.expose()
+                    component.draw(surface, node_state)
+                else:
+                    dirty_rects.extend(component.draw(surface, node_state))
+
+                marks[ordinal] = len(dirty_rects)
+                index += 1
+                continue
+
+            child_states[ordinal] = component.bind_children(node_state)
+
+            background, foreground = component.background, component.foreground
+            form = background.bind_template(node_state, component)
+            foreground_form = component.bind_foreground(node_state) if foreground else None
+            previous_form, forms[ordinal] = forms[ordinal], form
+            previous_foreground_form, foreground_forms[ordinal] = foreground_forms[ordinal], foreground_form
+            if not forced and (
+                    component.is_invalidated or
+                    not unchanged(previous_form, form) or
+                    not unchanged(previous_foreground_form, foreground_form)
+            ):
+                forced, forced_until = True, ends[ordinal]
+                dirty_rects.append(rect)
+
+            component.mark_clean()
+            if forced:
+                self._draw_background(screen, surface, rect, background, form, component)
+
+            marks[ordinal] = len(dirty_rects)
+            index += 1
+
+        self._flush(screen)
+        if self.is_stale(screen):
+            return self.execute(screen, state)
+
+        return dirty_rects
+
+
+__all__ = ['DisplayList']
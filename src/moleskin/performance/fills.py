@@ -0,0 +1,75 @@
+from typing import List, Optional
+from pygame import Color, Rect, Surface
+
+
+class FillBatch:
+    _merge_window = 32
+
+    @staticmethod
+    def _union(first: Rect, second: Rect) -> Optional[Rect]:
+        if first.contains(second):
+            return first
+
+        if second.contains(first):
+            return second
+
+        if (
+                first.top == second.top and first.height == second.height and
+                first.left <= second.right and second.left <= first.right
+        ) or (
+                first.left == second.left and first.width == second.width and
+                first.top <= second.bottom and second.top <= first.bottom
+        ):
+            return first.union(second)
+
+        return None
+
+    def __init__(self):
+        self._colors: List[Color] = []
+        self._rects: List[Rect] = []
+        self._requested = self._issued = 0
+
+    @property
+    def requested(self):
+        return self._requested
+
+    @property
+    def issued(self):
+        return self._issued
+
+    def __len__(self):
+        return len(self._rects)
+
+    def intersects(self, rect: Rect) -> bool:
+        return rect.collidelist(self._rects) != -1
+
+    def add(self, color: Color, rect: Rect):
+        self._requested += 1
+        if not rect.width or not rect.height:
+            return
+
+        colors, rects = self._colors, self._rects
+        for ordinal in range(len(rects) - 1, max(-1, len(rects) - 1 - self._merge_window), -1):
+            if colors[ordinal] != color:
+                continue
+
+            union = self._union(rects[ordinal], rect)
+            if union is not None and rect.collidelist(rects[ordinal + 1:]) == -1:
+                rects[ordinal] = union
+                return
+
+        colors.append(color)
+        rects.append(rect)
+
+    def flush(self, surface: Surface) -> int:
+        for color, rect in zip(self._colors, self._rects):
+            surface.fill(color, rect)
+
+        issued = len(self._rects)
+        self._issued += issued
+        self._colors.clear()
+        self._rects.clear()
+        return issued
+
+
+__all__ = ['FillBatch']
@@ -0,0 +1,90 @@
+import json
+from os import PathLike
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+from weakref import WeakKeyDictionary
+import pygame.font
+from pygame.font import Font
+from moleskin.performance.lru import LRUCache
+from moleskin.startup import ASSET, trace
+
+FontKey = Tuple[str, int, bool, bool]
+FontSpec = Union[Tuple[str, int], Tuple[str, int, bool], Tuple[str, int, bool, bool]]
+FontPath = Tuple[Optional[str], bool, bool]
+
+
+class FontCache(LRUCache[FontKey, Font]):
+    @classmethod
+    def _measure(cls, value: Font) -> int:
+        return 1
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        return ''.join(name.lower().split())
+
+    def __init__(self, size: Union[str, int], index_path: Optional[Union[str, PathLike]] = None):
+        super().__init__(size)
+        self._index_path = Path(index_path) if index_path else None
+        self._paths: Dict[Tuple[str, bool, bool], FontPath] = {}
+        self._keys: WeakKeyDictionary[Font, FontKey] = WeakKeyDictionary()
+        if self._index_path and self._index_path.is_file():
+            try:
+                entries = json.loads(self._index_path.read_text())
+            except (OSError, ValueError):
+                entries = ()
+
+            for name, bold, italic, path, synthetic_bold, synthetic_italic in entries:
+                self._paths[name, bold, italic] = path, synthetic_bold, synthetic_italic
+
+    @property
+    def index_path(self):
+        return self._index_path
+
+    def _save_index(self):
+        if self._index_path:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            self._index_path.write_text(json.dumps([
+                (name, bold, italic, path, synthetic_bold, synthetic_italic)
+                for (name, bold, italic), (path, synthetic_bold, synthetic_italic) in self._paths.items()
+                if path is not None
+            ]))
+
+    def key(self, font: Font) -> Optional[FontKey]:
+        return self._keys.get(font)
+
+    def path(self, name: str, bold: bool = False, italic: bool = False) -> FontPath:
+        key = (self._normalize(name), bold, italic)
+        try:
+            return self._paths[key]
+        except KeyError:
+            pass
+
+        path = pygame.font.match_font(name, bold, italic)
+        font_path = self._paths[key] = (
+            path,
+            bold and path is not None and path == pygame.font.match_font(name, False, italic),
+            italic and path is not None and path == pygame.font.match_font(name, bold, False)
+        ) if path else (None, bold, italic)
+        self._save_index()
+        return font_path
+
+    def font(self, name: str, size: int, bold: bool = False, italic: bool = False) -> Font:
+        key = (self._normalize(name), int(size), bold, italic)
+        font = self.get(key)
+        if font is None:
+            with trace.span(ASSET, f"font {key}"):
+                path, synthetic_bold, synthetic_italic = self.path(name, bold, italic)
+                font = Font(path, key[1])
+                font.set_bold(synthetic_bold)
+                font.set_italic(synthetic_italic)
+
+            self._keys[font] = key
+            self.put(key, font)
+
+        return font
+
+    def preload(self, specs: Iterable[FontSpec]) -> Tuple[Font, ...]:
+        return tuple(self.font(*spec) for spec in specs)
+
+
+__all__ = ['FontCache']
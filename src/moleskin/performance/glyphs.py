@@ -0,0 +1,132 @@
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+import pygame
+from pygame import Color, Rect, Surface
+from pygame.font import Font
+from moleskin.layout import Size
+from moleskin.performance.lru import LRUCache
+
+Glyph = Tuple[Rect, int]
+
+
+class GlyphAtlas:
+    _sheet_width = 512
+
+    def __init__(self, font: Font, antialias: bool, color: Color, bg_color: Optional[Color]):
+        self._font, self._antialias, self._color, self._bg_color = font, antialias, color, bg_color
+        self._line_height = font.get_height()
+        self._flags = pygame.SRCALPHA if bg_color is None else 0
+        self._sheet = Surface((self._sheet_width, self._line_height), self._flags)
+        self._cursor = (0, 0, 0)
+        self._glyphs: Dict[str, Glyph] = {}
+
+    @property
+    def sheet(self):
+        return self._sheet
+
+    @property
+    def line_height(self):
+        return self._line_height
+
+    def __len__(self):
+        return len(self._glyphs)
+
+    def _grow(self, width: int, height: int):
+        sheet = Surface((max(width, self._sheet.get_width()), height), self._flags)
+        sheet.blit(self._sheet, (0, 0))
+        self._sheet = sheet
+
+    def _rasterize(self, char: str) -> Glyph:
+        if not self._font.size(char)[0]:
+            glyph = self._glyphs[char] = Rect(0, 0, 0, 0), 0
+            return glyph
+
+        glyph_surface = self._font.render(char, self._antialias, self._color, self._bg_color)
+        width, height = glyph_surface.get_size()
+        x, y, shelf_height = self._cursor
+        if x + width > self._sheet.get_width() and x:
+            x, y, shelf_height = 0, y + shelf_height, 0
+
+        if y + height > self._sheet.get_height() or x + width > self._sheet.get_width():
+            self._grow(x + width, max(y + height, 2 * self._sheet.get_height()))
+
+        self._sheet.blit(glyph_surface, (x, y))
+        self._cursor = x + width, y, max(shelf_height, height)
+        glyph = self._glyphs[char] = Rect(x, y, width, height), width
+        return glyph
+
+    def glyph(self, char: str) -> Glyph:
+        try:
+            return self._glyphs[char]
+        except KeyError:
+            return self._rasterize(char)
+
+    def glyphs(self, text: str) -> List[Glyph]:
+        glyphs = self._glyphs
+        return [glyphs[char] if char in glyphs else self._rasterize(char) for char in text]
+
+    def text_size(self, text: str) -> Size:
+        return sum(advance for _, advance in self.glyphs(text)), self._line_height
+
+    def draw(self, surface: Surface, position: Tuple[int, int], text: str) -> Rect:
+        glyphs = self.glyphs(text)
+        x, y = position
+        sheet, blits = self._sheet, []
+        for area, advance in glyphs:
+            blits.append((sheet, (x, y), area))
+            x += advance
+
+        surface.blits(blits, False)
+        return Rect(position, (x - position[0], self._line_height))
+
+
+class GlyphCache(LRUCache[Hashable, GlyphAtlas]):
+    @classmethod
+    def _measure(cls, value: GlyphAtlas):
+        return value.sheet.get_pitch() * value.sheet.get_height()
+
+    @staticmethod
+    def _key(font: Font, antialias: bool, color: Color, bg_color: Optional[Color]) -> Hashable:
+        return font, antialias, tuple(color), None if bg_color is None else tuple(bg_color)
+
+    def __init__(self, size: Union[str, int]):
+        super().__init__(size)
+        self._advances: Dict[Tuple[Font, str], int] = {}
+
+    def atlas(self, font: Font, antialias: bool, color: Color, bg_color: Optional[Color]) -> GlyphAtlas:
+        key = self._key(font, antialias, color, bg_color)
+        atlas = self.get(key)
+        return self.put(key, GlyphAtlas(font, antialias, color, bg_color)) if atlas is None else atlas
+
+    def _advance(self, font: Font, char: str) -> int:
+        key = (font, char)
+        try:
+            return self._advances[key]
+        except KeyError:
+            advance, _ = font.size(char)
+            self._advances[key] = advance
+            return advance
+
+    def text_size(self, font: Font, text: str) -> Size:
+        return sum(self._advance(font, char) for char in text), font.get_height()
+
+    def draw(
+            self,
+            surface: Surface,
+            position: Tuple[int, int],
+            font: Font,
+            text: str,
+            antialias: bool,
+            color: Color,
+            bg_color: Optional[Color]
+    ) -> Rect:
+        key = self._key(font, antialias, color, bg_color)
+        atlas = self.atlas(font, antialias, color, bg_color)
+        glyph_count = len(atlas)
+        rect = atlas.draw(surface, position, text)
+        if len(atlas) != glyph_count:
+            self.put(key, atlas)
+
+        return rect
+
+
+__all__ = ['GlyphAtlas', 'GlyphCache']
@@ -1,68 +1,110 @@
-import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from sys import getsizeof
-from typing import Union, Dict, List, Tuple
+from threading import RLock
+from typing import Union, Dict, Iterable, Tuple, Optional, TYPE_CHECKING
+from moleskin.performance.lru import LRUCache
+from moleskin.startup import ASSET, trace, load_module
 
-from PIL import Image
+if TYPE_CHECKING:
+    from PIL import Image
 
 
-class ImageCache:
-    _storage_units: Dict[str, int] = {
-        f"{letter}{'i' if base == 2 else ''}b": base ** (power * ordinal)
-        for (base, power) in ((2, 10), (10, 3))
-        for ordinal, letter in enumerate('kmgtpezy', start=1)
+class ImageCache(LRUCache[str, 'Image.Image']):
+    _band_sizes: Dict[str, int] = {
+        'I': 4,
+        'F': 4,
+        'I;16': 2,
+        'I;16B': 2,
+        'I;16L': 2,
+        'I;16N': 2
     }
-    _size_re = re.compile(
-        rf"(\d+)\s*({r'|'.join(r''.join(rf'[{char}{char.upper()}]' for char in key) for key in _storage_units)})"
-    )
 
     @classmethod
-    def _parse_size_expr(cls, expr: str):
-        matched_str = re.match(cls._size_re, expr)
-        if matched_str:
-            value, units = matched_str.groups()
-            return value * cls._storage_units[units.lower()]
+    def _measure(cls, image: 'Image.Image'):
+        width, height = image.size
+        return width * height * len(image.getbands()) * cls._band_sizes.get(image.mode, 1)
 
-        raise ValueError(f"illegal size expression '{expr}'")
+    @staticmethod
+    def _decode(key: str) -> 'Image.Image':
+        pil_image = load_module('PIL.Image')
+        with trace.span(ASSET, key), open(key, 'rb') as fp:
+            image = pil_image.open(fp)
+            image.load()
 
-    def __init__(self, size: Union[str, int]):
-        self._size = size if type(size) is int else self._parse_size_expr(size)
-        self._capacity = self._size
-        self._images: Dict[str, Image.Image] = {}
-        self._lru: List[Tuple[int, str]] = []
+        return image
 
-    @property
-    def size(self):
-        return self._size
+    def __init__(self, size: Union[str, int], workers: Optional[int] = None):
+        super().__init__(size)
+        self._workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = RLock()
+
+    def _load(self, key: str) -> 'Image.Image':
+        try:
+            image = self._decode(key)
+        except BaseException:
+            with self._lock:
+                self._pending.pop(key, None)
+            raise
+
+        with self._lock:
+            self._pending.pop(key, None)
+            return self.put(key, image)
 
     def __getitem__(self, key: Union[str, Path]):
         key = str(key)
-        try:
-            return self._images[key]
-        except KeyError:
-            with open(key, 'rb') as fp:
-                image = Image.open(fp)
-                image.load()
-
-            size = getsizeof(image)
-            while self._capacity < size:
-                freed_size, freed_key = self._lru.pop()
-                self._images.pop(freed_key)
-                self._capacity += freed_size
-
-            self._images[key] = image
-            self._lru.insert(0, (size, key))
-            self._capacity -= size
-            return image
+        with self._lock:
+            image = self.get(key)
+            pending = self._pending.get(key) if image is None else None
+
+        if pending:
+            return pending.result()
+
+        if image is None:
+            image = self._decode(key)
+            with self._lock:
+                self.put(key, image)
+
+        return image
+
+    def fetch(self, key: Union[str, Path]) -> Future:
+        key = str(key)
+        with self._lock:
+            image = self.get(key)
+            if image is not None:
+                future = Future()
+                future.set_result(image)
+                return future
+
+            try:
+                return self._pending[key]
+            except KeyError:
+                if not self._executor:
+                    self._executor = ThreadPoolExecutor(self._workers, thread_name_prefix='moleskin-images')
+
+                future = self._pending[key] = self._executor.submit(self._load, key)
+                return future
+
+    def prefetch(self, paths: Iterable[Union[str, Path]]) -> Tuple[Future, ...]:
+        return tuple(self.fetch(path) for path in paths)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor:
+            executor.shutdown(wait)
 
     @property
-    def storage_use(self):
-        return sum(getsizeof(image) for image in self._images.values())
+    def pending_keys(self):
+        with self._lock:
+            return set(self._pending)
 
     @property
     def lru_keys(self):
-        return set(key for _, key in self._lru)
+        return set(self.keys())
 
     @property
     def storage_keys(self):
-        return set(self._images)
+        return set(self._entries)
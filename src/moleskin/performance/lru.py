@@ -0,0 +1,124 @@
+import re
+from collections import OrderedDict
+from sys import getsizeof
+from typing import Union, Dict, Generic, TypeVar, Hashable, Optional, Tuple, NamedTuple
+
+Key = TypeVar('Key', bound=Hashable)
+Value = TypeVar('Value')
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    storage_use: int
+    size: int
+
+
+class LRUCache(Generic[Key, Value]):
+    _storage_units: Dict[str, int] = {
+        f"{letter}{'i' if base == 2 else ''}b": base ** (power * ordinal)
+        for (base, power) in ((2, 10), (10, 3))
+        for ordinal, letter in enumerate('kmgtpezy', start=1)
+    }
+    _size_re = re.compile(
+        rf"(\d+)\s*({r'|'.join(r''.join(rf'[{char}{char.upper()}]' for char in key) for key in _storage_units)})?"
+    )
+
+    @classmethod
+    def _parse_size_expr(cls, expr: str):
+        matched_str = re.fullmatch(cls._size_re, expr.strip())
+        if matched_str:
+            value, units = matched_str.groups()
+            return int(value) * (cls._storage_units[units.lower()] if units else 1)
+
+        raise ValueError(f"illegal size expression '{expr}'")
+
+    @classmethod
+    def _measure(cls, value: Value) -> int:
+        return getsizeof(value)
+
+    def _evicted(self, key: Key, value: Value):
+        pass
+
+    def __init__(self, size: Union[str, int]):
+        self._size = size if type(size) is int else self._parse_size_expr(size)
+        self._capacity = self._size
+        self._entries: OrderedDict[Key, Tuple[int, Value]] = OrderedDict()
+        self._hits = self._misses = self._evictions = 0
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def storage_use(self):
+        return self._size - self._capacity
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def evictions(self):
+        return self._evictions
+
+    @property
+    def stats(self):
+        return CacheStats(self._hits, self._misses, self._evictions, self.storage_use, self._size)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Key):
+        return key in self._entries
+
+    def keys(self):
+        return tuple(self._entries)
+
+    def get(self, key: Key) -> Optional[Value]:
+        try:
+            _, value = self._entries[key]
+        except KeyError:
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def put(self, key: Key, value: Value) -> Value:
+        self.pop(key)
+        size = self._measure(value)
+        if size > self._size:
+            return value
+
+        while self._capacity < size:
+            evicted_key, (freed_size, evicted_value) = self._entries.popitem(last=False)
+            self._capacity += freed_size
+            self._evictions += 1
+            self._evicted(evicted_key, evicted_value)
+
+        self._entries[key] = size, value
+        self._capacity -= size
+        return value
+
+    def pop(self, key: Key) -> Optional[Value]:
+        try:
+            size, value = self._entries.pop(key)
+        except KeyError:
+            return None
+
+        self._capacity += size
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self._capacity = self._size
+
+
+__all__ = ['CacheStats', 'LRUCache']
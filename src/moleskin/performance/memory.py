@@ -0,0 +1,75 @@
+from sys import getsizeof
+from typing import Dict, Iterator, NamedTuple, Set
+from moleskin.backgrounds.image import BackgroundImageTemplate
+from moleskin.component import Component
+from moleskin.foreground import ForegroundTemplate
+from moleskin.performance.lru import CacheStats
+from moleskin.template import Template
+
+
+class MemoryReport(NamedTuple):
+    components: int
+    artists: int
+    templates: int
+    interned_templates: int
+    dict_instances: int
+    instance_bytes: int
+    caches: Dict[str, CacheStats]
+
+
+def _walk(component: Component) -> Iterator[Component]:
+    yield component
+    for child in component.children:
+        yield from _walk(child)
+
+
+def _instance_size(instance) -> int:
+    size = getsizeof(instance)
+    try:
+        size += getsizeof(instance.__dict__)
+    except AttributeError:
+        pass
+
+    return size
+
+
+def cache_stats() -> Dict[str, CacheStats]:
+    caches = {
+        'text': ForegroundTemplate.text_cache,
+        'glyphs': ForegroundTemplate.glyph_cache,
+        'fonts': ForegroundTemplate.font_cache,
+        'surfaces': BackgroundImageTemplate.surface_cache,
+        'textures': Component.texture_cache
+    }
+    if BackgroundImageTemplate.image_cache_created():
+        caches['images'] = BackgroundImageTemplate.image_cache()
+
+    return {name: cache.stats for name, cache in caches.items()}
+
+
+def memory_report(root: Component) -> MemoryReport:
+    seen: Set[int] = set()
+    components = artists = dict_instances = instance_bytes = 0
+    templates: Set[int] = set()
+    for component in _walk(root):
+        components += 1
+        for instance in (component, component.background, component.foreground):
+            if instance is None or id(instance) in seen:
+                continue
+
+            seen.add(id(instance))
+            artists += instance is not component
+            dict_instances += hasattr(instance, '__dict__')
+            instance_bytes += _instance_size(instance)
+            template = instance.template
+            if template is not None and id(template) not in templates:
+                templates.add(id(template))
+                dict_instances += hasattr(template, '__dict__')
+                instance_bytes += _instance_size(template)
+
+    return MemoryReport(
+        components, artists, len(templates), Template.interned_count(), dict_instances, instance_bytes, cache_stats()
+    )
+
+
+__all__ = ['MemoryReport', 'cache_stats', 'memory_report']
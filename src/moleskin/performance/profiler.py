@@ -0,0 +1,228 @@
+from __future__ import annotations
+import json
+import os
+from collections import deque, Counter
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from threading import get_ident
+from time import perf_counter_ns
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple, Any, Union
+from moleskin.artist import Artist
+from moleskin.component import Component
+from moleskin.components.frame import Frame
+from moleskin.layout import Layout
+from moleskin.performance.images import ImageCache
+from moleskin.performance.surfaces import SurfaceCache
+from moleskin.performance.text import TextCache
+
+Category = str
+
+
+class ProfileEvent(NamedTuple):
+    category: Category
+    name: str
+    target: int
+    thread: int
+    start: int
+    duration: int
+
+
+class FrameProfile(NamedTuple):
+    index: int
+    start: int
+    duration: int
+    events: Tuple[ProfileEvent, ...]
+    counters: Dict[str, int]
+
+
+FrameCallback = Callable[[FrameProfile], None]
+
+
+class Profiler:
+    _active: Optional[Profiler] = None
+
+    def __init__(self, frames: int = 120, on_frame: Optional[FrameCallback] = None):
+        self._frames: Deque[FrameProfile] = deque(maxlen=frames)
+        self._on_frame = on_frame
+        self._events: List[ProfileEvent] = []
+        self._counters: Counter = Counter()
+        self._frame_index = 0
+        self._frame_start: Optional[int] = None
+        self._patches: List[Tuple[type, str, Any]] = []
+
+    @property
+    def frames(self):
+        return tuple(self._frames)
+
+    @property
+    def is_enabled(self):
+        return Profiler._active is self
+
+    def _record(self, category: Category, target: Any, start: int):
+        self._events.append(ProfileEvent(
+            category, type(target).__name__, id(target), get_ident(), start, perf_counter_ns() - start
+        ))
+
+    def count(self, counter: str, amount: int = 1):
+        self._counters[counter] += amount
+
+    def _timed(self, category: Category, method: Callable) -> Callable:
+        @wraps(method)
+        def timed(target, *args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return method(target, *args, **kwargs)
+            finally:
+                self._record(category, target, start)
+
+        return timed
+
+    def _counted(self, hit_counter: str, miss_counter: str, method: Callable) -> Callable:
+        @wraps(method)
+        def counted(cache, *args, **kwargs):
+            misses = cache.misses
+            try:
+                return method(cache, *args, **kwargs)
+            finally:
+                self._counters[miss_counter if cache.misses > misses else hit_counter] += 1
+
+        return counted
+
+    def _framed(self, method: Callable) -> Callable:
+        @wraps(method)
+        def framed(*args, **kwargs):
+            with self.frame():
+                return method(*args, **kwargs)
+
+        return framed
+
+    def _patch(self, owner: type, name: str, wrapper: Callable[[Callable], Callable]):
+        method = owner.__dict__[name]
+        self._patches.append((owner, name, method))
+        setattr(owner, name, wrapper(method))
+
+    def enable(self):
+        if Profiler._active:
+            raise UserWarning("another profiler is already enabled")
+
+        Profiler._active = self
+        self._patch(Frame, 'render', self._framed)
+        self._patch(Component, 'draw', lambda method: self._timed('draw', method))
+        self._patch(Artist, 'bind_template', lambda method: self._timed('bind', method))
+        layouts = [Layout]
+        while layouts:
+            layout = layouts.pop()
+            layouts.extend(layout.__subclasses__())
+            if 'arrange' in layout.__dict__ and not getattr(layout.arrange, '__isabstractmethod__', False):
+                self._patch(layout, 'arrange', lambda method: self._timed('arrange', method))
+
+        self._patch(TextCache, 'render', lambda method: self._counted('text_cache_hits', 'text_renders', method))
+        self._patch(SurfaceCache, 'convert', lambda method: self._counted(
+            'surface_cache_hits', 'image_conversions', method
+        ))
+        self._patch(SurfaceCache, 'scale', lambda method: self._counted('surface_cache_hits', 'image_scales', method))
+        self._patch(ImageCache, '__getitem__', lambda method: self._counted(
+            'image_cache_hits', 'image_cache_misses', method
+        ))
+        self._patch(ImageCache, 'fetch', lambda method: self._counted('image_cache_hits', 'image_cache_misses', method))
+
+    def disable(self):
+        while self._patches:
+            owner, name, method = self._patches.pop()
+            setattr(owner, name, method)
+
+        if Profiler._active is self:
+            Profiler._active = None
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.disable()
+
+    def begin_frame(self):
+        self._frame_start = perf_counter_ns()
+
+    def end_frame(self) -> FrameProfile:
+        end = perf_counter_ns()
+        start = end if self._frame_start is None else self._frame_start
+        profile = FrameProfile(self._frame_index, start, end - start, tuple(self._events), dict(self._counters))
+        self._frames.append(profile)
+        self._frame_index += 1
+        self._frame_start = None
+        self._events.clear()
+        self._counters.clear()
+        if self._on_frame:
+            self._on_frame(profile)
+
+        return profile
+
+    @contextmanager
+    def frame(self):
+        self.begin_frame()
+        try:
+            yield self
+        finally:
+            self.end_frame()
+
+    def totals(self, category: Optional[Category] = None) -> Dict[Tuple[Category, str, int], int]:
+        totals: Counter = Counter()
+        for profile in self._frames:
+            for event in profile.events:
+                if category is None or event.category == category:
+                    totals[event.category, event.name, event.target] += event.duration
+
+        return dict(totals.most_common())
+
+    def to_json(self) -> Dict[str, Any]:
+        return {'frames': [
+            {
+                'index': profile.index,
+                'start_ms': profile.start / 1e6,
+                'duration_ms': profile.duration / 1e6,
+                'counters': profile.counters,
+                'events': [
+                    {
+                        'category': event.category,
+                        'name': event.name,
+                        'id': event.target,
+                        'thread': event.thread,
+                        'start_ms': event.start / 1e6,
+                        'duration_ms': event.duration / 1e6
+                    }
+                    for event in profile.events
+                ]
+            }
+            for profile in self._frames
+        ]}
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        pid = os.getpid()
+        trace_events: List[Dict[str, Any]] = []
+        for profile in self._frames:
+            trace_events.append({
+                'name': f'frame {profile.index}', 'cat': 'frame', 'ph': 'X', 'pid': pid, 'tid': get_ident(),
+                'ts': profile.start / 1e3, 'dur': profile.duration / 1e3
+            })
+            if profile.counters:
+                trace_events.append({
+                    'name': 'counters', 'ph': 'C', 'pid': pid, 'ts': profile.start / 1e3, 'args': profile.counters
+                })
+
+            trace_events.extend(
+                {
+                    'name': event.name, 'cat': event.category, 'ph': 'X', 'pid': pid, 'tid': event.thread,
+                    'ts': event.start / 1e3, 'dur': event.duration / 1e3, 'args': {'id': hex(event.target)}
+                }
+                for event in profile.events
+            )
+
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def dump(self, path: Union[str, Path], chrome_trace: bool = False):
+        Path(path).write_text(json.dumps(self.to_chrome_trace() if chrome_trace else self.to_json()))
+
+
+__all__ = ['ProfileEvent', 'FrameProfile', 'Profiler']
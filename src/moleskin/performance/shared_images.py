@@ -0,0 +1,351 @@
+import os
+import struct
+from contextlib import contextmanager
+from hashlib import sha1
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from tempfile import gettempdir
+from threading import Lock
+from time import sleep, time
+from typing import Optional, Set, Tuple, Union, TYPE_CHECKING
+from weakref import finalize
+from moleskin.performance.images import ImageCache
+from moleskin.performance.surfaces import SurfaceCache
+from moleskin.startup import load_module
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+FREE = 0
+DECODING = 1
+READY = 2
+
+Slot = Tuple[
+    bytes,
+    int,
+    int,
+    float,
+    int,
+    Tuple[int, ...]
+]
+
+
+class SharedImageCache(ImageCache):
+    _index_magic = b'MSKG'
+    _segment_magic = b'MSKI'
+    _index_header = struct.Struct('<4sII')
+    _max_holders = 16
+    _slot = struct.Struct(f'<20sIIdQ{_max_holders}I')
+    _segment_header = struct.Struct('<4s4sII')
+    _default_slots = 4096
+    _decode_timeout = 30.0
+    _poll_interval = 0.005
+
+    @staticmethod
+    def _open_segment(name: str, create: bool = False, size: int = 0) -> SharedMemory:
+        try:
+            return SharedMemory(name, create, size, track=False)
+        except TypeError:
+            segment = SharedMemory(name, create, size)
+            resource_tracker.unregister(getattr(segment, '_name', f'/{name}'), 'shared_memory')
+            return segment
+
+    @staticmethod
+    def _unlink_segment(name: str):
+        try:
+            segment = SharedMemory(name)
+        except FileNotFoundError:
+            return
+
+        segment.close()
+        segment.unlink()
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+
+        return True
+
+    @classmethod
+    def is_supported(cls) -> bool:
+        return fcntl is not None
+
+    def __init__(
+            self,
+            size: Union[str, int],
+            group: str = 'moleskin',
+            group_size: Optional[Union[str, int]] = None,
+            slots: Optional[int] = None,
+            workers: Optional[int] = None
+    ):
+        if not self.is_supported():
+            raise OSError("shared image groups need POSIX file locks (fcntl)")
+
+        super().__init__(size, workers)
+        self._group = group
+        self._prefix = sha1(group.encode()).hexdigest()[:12]
+        self._group_size = self._size if group_size is None else (
+            group_size if type(group_size) is int else self._parse_size_expr(group_size)
+        )
+        self._slot_count = slots
+        self._attached: Set[str] = set()
+        self._thread_lock = Lock()
+        self._lock_path = Path(gettempdir()) / f'moleskin-{self._prefix}.lock'
+        self._lock_file = open(self._lock_path, 'a+b')
+        with self._group_lock():
+            self._index = self._open_index()
+
+    @property
+    def group(self):
+        return self._group
+
+    @property
+    def group_size(self):
+        return self._group_size
+
+    @property
+    def attached_keys(self):
+        with self._thread_lock:
+            return set(self._attached)
+
+    def _segment_name(self, digest: bytes) -> str:
+        return f'{self._prefix}-{digest.hex()[:16]}'
+
+    def _open_index(self) -> SharedMemory:
+        name = f'{self._prefix}-index'
+        try:
+            index = self._open_segment(name)
+        except FileNotFoundError:
+            self._slot_count = self._slot_count or self._default_slots
+            index = self._open_segment(name, True, self._index_header.size + self._slot_count * self._slot.size)
+            self._index_header.pack_into(index.buf, 0, self._index_magic, self._slot_count, self._max_holders)
+            return index
+
+        magic, slot_count, max_holders = self._index_header.unpack_from(index.buf)
+        if (
+                magic != self._index_magic or
+                slot_count != (self._slot_count or slot_count) or
+                max_holders != self._max_holders
+        ):
+            index.close()
+            raise ValueError(f"shared image group '{self._group}' has an incompatible index")
+
+        self._slot_count = slot_count
+        return index
+
+    @contextmanager
+    def _group_lock(self):
+        with self._thread_lock:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _read_slot(self, ordinal: int) -> Slot:
+        digest, state, pid, last_used, nbytes, *holders = self._slot.unpack_from(
+            self._index.buf, self._index_header.size + ordinal * self._slot.size
+        )
+        return digest, state, pid, last_used, nbytes, tuple(holder for holder in holders if holder)
+
+    def _write_slot(
+            self,
+            ordinal: int,
+            digest: bytes,
+            state: int,
+            pid: int,
+            last_used: float,
+            nbytes: int,
+            holders: Tuple[int, ...] = ()
+    ):
+        self._slot.pack_into(
+            self._index.buf, self._index_header.size + ordinal * self._slot.size,
+            digest, state, pid, last_used, nbytes, *holders, *(0,) * (self._max_holders - len(holders))
+        )
+
+    def _free_slot(self, ordinal: int, digest: bytes):
+        self._unlink_segment(self._segment_name(digest))
+        self._write_slot(ordinal, bytes(20), FREE, 0, 0.0, 0)
+
+    def _find(self, digest: bytes) -> Tuple[Optional[int], Optional[int]]:
+        free = None
+        for ordinal in range(self._slot_count):
+            slot_digest, state, _, _, _, _ = self._read_slot(ordinal)
+            if state == FREE:
+                free = ordinal if free is None else free
+            elif slot_digest == digest:
+                return ordinal, free
+
+        return None, free
+
+    def _evict_group(self, keep: Optional[int] = None, needs_slot: bool = False) -> Optional[int]:
+        ready = []
+        freed = None
+        for ordinal in range(self._slot_count):
+            digest, state, pid, last_used, nbytes, holders = self._read_slot(ordinal)
+            if state == DECODING and not self._is_alive(pid):
+                self._free_slot(ordinal, digest)
+                freed = ordinal if freed is None else freed
+            elif state == READY:
+                live_holders = tuple(holder for holder in holders if self._is_alive(holder))
+                if live_holders != holders:
+                    self._write_slot(ordinal, digest, state, pid, last_used, nbytes, live_holders)
+
+                ready.append((ordinal, digest, last_used, nbytes, live_holders))
+
+        total = sum(nbytes for _, _, _, nbytes, _ in ready)
+        for ordinal, digest, _, nbytes, holders in sorted(ready, key=lambda slot: slot[2]):
+            if total <= self._group_size and not (needs_slot and freed is None):
+                break
+
+            if holders or ordinal == keep:
+                continue
+
+            self._free_slot(ordinal, digest)
+            total -= nbytes
+            freed = ordinal if freed is None else freed
+
+        return freed
+
+    def _attach(self, key: str, digest: bytes) -> 'Image.Image':
+        pil_image = load_module('PIL.Image')
+        segment = self._open_segment(self._segment_name(digest))
+        magic, mode, width, height = self._segment_header.unpack_from(segment.buf)
+        if magic != self._segment_magic:
+            segment.close()
+            raise ValueError(f"shared image segment for '{key}' is corrupt")
+
+        mode = mode.decode()
+        view = segment.buf[self._segment_header.size:self._segment_header.size + width * height * 4].toreadonly()
+        finalize(view, segment.close).atexit = False
+        return pil_image.frombuffer(mode, (width, height), view, 'raw', mode, 0, 1)
+
+    def _publish(self, key: str, digest: bytes):
+        image = ImageCache._decode(key)
+        mode = 'RGBA' if SurfaceCache.image_format(image) == 'RGBA' else 'RGBX'
+        pixels = (image if image.mode == mode else image.convert(mode)).tobytes()
+        name = self._segment_name(digest)
+        try:
+            segment = self._open_segment(name, True, self._segment_header.size + len(pixels))
+        except FileExistsError:
+            self._unlink_segment(name)
+            segment = self._open_segment(name, True, self._segment_header.size + len(pixels))
+
+        self._segment_header.pack_into(segment.buf, 0, self._segment_magic, mode.encode(), *image.size)
+        segment.buf[self._segment_header.size:self._segment_header.size + len(pixels)] = pixels
+        segment.close()
+        return len(pixels)
+
+    def _decode(self, key: str) -> 'Image.Image':
+        digest = sha1(key.encode()).digest()
+        own_pid = os.getpid()
+        deadline = None
+        while True:
+            with self._group_lock():
+                ordinal, free = self._find(digest)
+                if ordinal is None:
+                    ordinal = free if free is not None else self._evict_group(needs_slot=True)
+                    if ordinal is not None:
+                        self._write_slot(ordinal, digest, DECODING, own_pid, time(), 0)
+
+                    break
+
+                _, state, pid, _, nbytes, holders = self._read_slot(ordinal)
+                if state == READY:
+                    if own_pid not in holders:
+                        holders = tuple(holder for holder in holders if self._is_alive(holder))
+                        if len(holders) == self._max_holders:
+                            ordinal = None
+                            break
+
+                        holders += own_pid,
+
+                    self._write_slot(ordinal, digest, READY, pid, time(), nbytes, holders)
+                    self._attached.add(key)
+                    return self._attach(key, digest)
+
+                if not self._is_alive(pid) or (deadline is not None and time() > deadline):
+                    self._write_slot(ordinal, digest, DECODING, own_pid, time(), 0)
+                    break
+
+            deadline = deadline or time() + self._decode_timeout
+            sleep(self._poll_interval)
+
+        if ordinal is None:
+            return ImageCache._decode(key)
+
+        try:
+            nbytes = self._publish(key, digest)
+        except BaseException:
+            with self._group_lock():
+                self._write_slot(ordinal, bytes(20), FREE, 0, 0.0, 0)
+            raise
+
+        with self._group_lock():
+            self._write_slot(ordinal, digest, READY, own_pid, time(), nbytes, (own_pid,))
+            self._attached.add(key)
+            self._evict_group(keep=ordinal)
+            return self._attach(key, digest)
+
+    def _release(self, key: str):
+        if key not in self._attached:
+            return
+
+        digest = sha1(key.encode()).digest()
+        with self._group_lock():
+            self._attached.discard(key)
+            ordinal, _ = self._find(digest)
+            if ordinal is not None:
+                own_pid = os.getpid()
+                _, state, pid, last_used, nbytes, holders = self._read_slot(ordinal)
+                holders = tuple(holder for holder in holders if holder != own_pid)
+                self._write_slot(ordinal, digest, state, pid, last_used, nbytes, holders)
+
+    def _evicted(self, key: str, value: 'Image.Image'):
+        self._release(key)
+
+    def put(self, key: str, value: 'Image.Image') -> 'Image.Image':
+        super().put(key, value)
+        if key not in self:
+            self._release(key)
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            keys = self.keys()
+            super().clear()
+
+        for key in keys:
+            self._release(key)
+
+    def shutdown(self, wait: bool = True):
+        super().shutdown(wait)
+        self.clear()
+
+    def destroy(self):
+        self.shutdown()
+        with self._group_lock():
+            for ordinal in range(self._slot_count):
+                digest, state, _, _, _, _ = self._read_slot(ordinal)
+                if state != FREE:
+                    self._free_slot(ordinal, digest)
+
+            self._index.close()
+            self._unlink_segment(f'{self._prefix}-index')
+
+        self._lock_file.close()
+
+
+__all__ = ['SharedImageCache']
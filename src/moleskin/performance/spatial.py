@@ -0,0 +1,54 @@
+from math import sqrt
+from typing import Dict, List, Optional, Sequence, Tuple
+from pygame import Rect
+
+Cell = Tuple[
+    int,
+    int
+]
+
+
+class GridIndex:
+    @staticmethod
+    def _cell_size(rects: Sequence[Rect]) -> int:
+        areas = [rect.width * rect.height for rect in rects if rect.width and rect.height]
+        return max(1, int(sqrt(sum(areas) / len(areas)))) if areas else 1
+
+    def __init__(self, rects: Sequence[Rect], cell_size: Optional[int] = None):
+        self._rects = tuple(rects)
+        self._cell_size = cell_size or self._cell_size(self._rects)
+        self._cells: Dict[Cell, List[int]] = {}
+        for ordinal, rect in enumerate(self._rects):
+            if not rect.width or not rect.height:
+                continue
+
+            for column in range(rect.left // self._cell_size, (rect.right - 1) // self._cell_size + 1):
+                for row in range(rect.top // self._cell_size, (rect.bottom - 1) // self._cell_size + 1):
+                    try:
+                        self._cells[column, row].append(ordinal)
+                    except KeyError:
+                        self._cells[column, row] = [ordinal]
+
+    @property
+    def rects(self):
+        return self._rects
+
+    @property
+    def cell_size(self):
+        return self._cell_size
+
+    def query(self, x: int, y: int) -> Optional[int]:
+        for ordinal in reversed(self._cells.get((x // self._cell_size, y // self._cell_size), ())):
+            if self._rects[ordinal].collidepoint(x, y):
+                return ordinal
+
+        return None
+
+    def query_all(self, x: int, y: int) -> Tuple[int, ...]:
+        return tuple(
+            ordinal for ordinal in self._cells.get((x // self._cell_size, y // self._cell_size), ())
+            if self._rects[ordinal].collidepoint(x, y)
+        )
+
+
+__all__ = ['GridIndex']
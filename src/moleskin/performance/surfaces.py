@@ -0,0 +1,74 @@
+from typing import Tuple, Literal, Optional, Any, get_args, TYPE_CHECKING
+import pygame
+from pygame import Surface
+from moleskin.layout import Size
+from moleskin.performance.lru import LRUCache
+
+if TYPE_CHECKING:
+    from PIL.Image import Image
+
+SupportedImageFormat = Literal['RGB', 'RGBA']
+
+SurfaceKey = Tuple[
+    int,
+    Optional[Size]
+]
+
+SurfaceEntry = Tuple[
+    Any,
+    Surface
+]
+
+
+class SurfaceCache(LRUCache[SurfaceKey, SurfaceEntry]):
+    _supported_image_formats: Tuple[SupportedImageFormat, ...] = get_args(SupportedImageFormat)
+
+    @classmethod
+    def _measure(cls, value):
+        _, surface = value
+        return surface.get_pitch() * surface.get_height()
+
+    @classmethod
+    def image_format(cls, image: 'Image') -> SupportedImageFormat:
+        if image.mode in cls._supported_image_formats:
+            return image.mode
+
+        return 'RGBA' if 'A' in image.mode or 'transparency' in image.info else 'RGB'
+
+    @staticmethod
+    def _to_display_format(surface: Surface, alpha: bool) -> Surface:
+        if not pygame.display.get_init() or pygame.display.get_surface() is None:
+            return surface
+
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def convert(self, image: 'Image') -> Surface:
+        key = (id(image), None)
+        entry = self.get(key)
+        if entry is None:
+            image_format = self.image_format(image)
+            source = image if image.mode == image_format else image.convert(image_format)
+            entry = self.put(key, (image, self._to_display_format(
+                pygame.image.frombytes(source.tobytes(), source.size, image_format), image_format == 'RGBA'
+            )))
+
+        _, surface = entry
+        return surface
+
+    def scale(self, surface: Surface, size: Size) -> Surface:
+        if surface.get_size() == size:
+            return surface
+
+        key = (id(surface), size)
+        entry = self.get(key)
+        if entry is None:
+            entry = self.put(key, (surface, (
+                pygame.transform.smoothscale(surface, size) if surface.get_bitsize() in (24, 32) else
+                pygame.transform.scale(surface, size)
+            )))
+
+        _, scaled_surface = entry
+        return scaled_surface
+
+
+__all__ = ['SupportedImageFormat', 'SurfaceCache']
@@ -0,0 +1,31 @@
+from sys import getsizeof
+from typing import Hashable, Union, Optional, Tuple
+from pygame import Surface, Color
+from pygame.font import Font
+from moleskin.layout import Size
+from moleskin.performance.lru import LRUCache
+
+ColorKey = Optional[Tuple[int, ...]]
+
+
+class TextCache(LRUCache[Hashable, Union[Surface, Size]]):
+    @classmethod
+    def _measure(cls, value):
+        return value.get_pitch() * value.get_height() if isinstance(value, Surface) else getsizeof(value)
+
+    @staticmethod
+    def _color_key(color: Optional[Color]) -> ColorKey:
+        return None if color is None else tuple(color)
+
+    def render(self, font: Font, text: str, antialias: bool, color: Color, bg_color: Optional[Color]) -> Surface:
+        key = (font, text, antialias, self._color_key(color), self._color_key(bg_color))
+        surface = self.get(key)
+        return self.put(key, font.render(text, antialias, color, bg_color)) if surface is None else surface
+
+    def text_size(self, font: Font, text: str) -> Size:
+        key = (font, text)
+        size = self.get(key)
+        return self.put(key, font.size(text)) if size is None else size
+
+
+__all__ = ['TextCache']
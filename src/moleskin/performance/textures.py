@@ -0,0 +1,39 @@
+from typing import Dict, Tuple, Union
+from weakref import finalize
+import pygame
+from pygame import Surface
+from moleskin.layout import Size
+from moleskin.performance.lru import LRUCache
+
+
+class TextureCache(LRUCache[int, Surface]):
+    @classmethod
+    def _measure(cls, value):
+        return value.get_pitch() * value.get_height()
+
+    @staticmethod
+    def _create(size: Size) -> Surface:
+        surface = Surface(size, pygame.SRCALPHA)
+        return surface.convert_alpha() if pygame.display.get_init() and pygame.display.get_surface() else surface
+
+    def __init__(self, size: Union[str, int]):
+        super().__init__(size)
+        self._finalizers: Dict[int, finalize] = {}
+
+    def _discard(self, key: int):
+        self._finalizers.pop(key, None)
+        self.pop(key)
+
+    def texture(self, owner, size: Size) -> Tuple[Surface, bool]:
+        key = id(owner)
+        surface = self.get(key)
+        if surface is not None and surface.get_size() == size:
+            return surface, False
+
+        if key not in self._finalizers:
+            self._finalizers[key] = finalize(owner, self._discard, key)
+
+        return self.put(key, self._create(size)), True
+
+
+__all__ = ['TextureCache']
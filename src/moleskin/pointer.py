@@ -0,0 +1,60 @@
+from typing import Tuple, Optional
+from moleskin.component import Component
+
+
+class Pointer:
+    def __init__(self, root: Component):
+        self._root = root
+        self._hovered: Tuple[Component, ...] = ()
+        self._dragged: Optional[Component] = None
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def hovered(self) -> Optional[Component]:
+        return self._hovered[-1] if self._hovered else None
+
+    @property
+    def dragged(self):
+        return self._dragged
+
+    def move(self, x: int, y: int):
+        path = self._root.hit_path(x, y)
+        hovered = tuple(component for component, _, _ in path)
+        common = next(
+            (
+                ordinal for ordinal, (previous, current) in enumerate(zip(self._hovered, hovered))
+                if previous is not current
+            ),
+            min(len(self._hovered), len(hovered))
+        )
+        for component in reversed(self._hovered[common:]):
+            component.on_leave()
+
+        for component in hovered[common:]:
+            component.on_enter()
+
+        self._hovered = hovered
+        component, local_x, local_y = path[-1]
+        component.on_hover(local_x, local_y)
+
+    def press(self, x: int, y: int):
+        component, _, _ = self._root.hit_path(x, y)[-1]
+        self._dragged = component
+        return self._root.on_click(x, y)
+
+    def release(self, x: int, y: int) -> Optional[Component]:
+        source, self._dragged = self._dragged, None
+        if source is None:
+            return None
+
+        for target, local_x, local_y in reversed(self._root.hit_path(x, y)):
+            if target is not source and target.on_drop(source, local_x, local_y):
+                return target
+
+        return None
+
+
+__all__ = ['Pointer']
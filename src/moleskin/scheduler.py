@@ -0,0 +1,123 @@
+from collections import deque
+from contextlib import contextmanager
+from math import ceil
+from time import perf_counter
+from typing import Deque, NamedTuple, Optional, Sequence
+import pygame
+
+
+def percentile(sorted_values: Sequence[float], rank: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, max(0, ceil(rank / 100 * len(sorted_values)) - 1))]
+
+
+class FrameStats(NamedTuple):
+    frames: int
+    rendered: int
+    skipped: int
+    fps: float
+    mean_ms: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+    idle_ms: float
+
+
+class Scheduler:
+    def __init__(
+            self,
+            target_fps: Optional[float] = 60,
+            update_rate: Optional[float] = None,
+            max_updates: int = 5,
+            max_skipped_frames: int = 2,
+            samples: int = 240
+    ):
+        self._target_fps = target_fps
+        self._timestep = 1 / (update_rate or target_fps or 60)
+        self._budget = 1 / target_fps if target_fps else self._timestep
+        self._max_updates = max_updates
+        self._max_skipped_frames = max_skipped_frames
+        self._clock = pygame.time.Clock()
+        self._accumulator = 0.0
+        self._previous_start: Optional[float] = None
+        self._frame_start = 0.0
+        self._behind = False
+        self._consecutive_skips = 0
+        self._frames = self._skipped = 0
+        self._idle_time = 0.0
+        self._frame_times: Deque[float] = deque(maxlen=samples)
+        self._intervals: Deque[float] = deque(maxlen=samples)
+
+    @property
+    def target_fps(self):
+        return self._target_fps
+
+    @property
+    def timestep(self):
+        return self._timestep
+
+    @property
+    def alpha(self):
+        return self._accumulator / self._timestep
+
+    @property
+    def idle_time(self):
+        return self._idle_time
+
+    def reset(self):
+        self._accumulator = 0.0
+        self._previous_start = None
+
+    @contextmanager
+    def idle(self):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._idle_time += perf_counter() - start
+            self.reset()
+
+    def begin_frame(self) -> int:
+        self._frame_start = perf_counter()
+        elapsed = 0.0 if self._previous_start is None else self._frame_start - self._previous_start
+        self._previous_start = self._frame_start
+        if elapsed:
+            self._intervals.append(elapsed)
+
+        self._accumulator += min(elapsed, self._timestep * self._max_updates)
+        updates = min(int(self._accumulator // self._timestep), self._max_updates)
+        self._accumulator -= updates * self._timestep
+        self._behind = elapsed > 2 * self._budget
+        self._frames += 1
+        return updates
+
+    def should_render(self) -> bool:
+        if self._behind and self._consecutive_skips < self._max_skipped_frames:
+            self._consecutive_skips += 1
+            self._skipped += 1
+            return False
+
+        self._consecutive_skips = 0
+        return True
+
+    def end_frame(self):
+        self._frame_times.append(perf_counter() - self._frame_start)
+        if self._target_fps:
+            self._clock.tick(self._target_fps)
+
+    @property
+    def stats(self) -> FrameStats:
+        frame_times = sorted(self._frame_times) or [0.0]
+        return FrameStats(
+            self._frames,
+            self._frames - self._skipped,
+            self._skipped,
+            len(self._intervals) / sum(self._intervals) if self._intervals else 0.0,
+            sum(frame_times) / len(frame_times) * 1000,
+            percentile(frame_times, 50) * 1000,
+            percentile(frame_times, 99) * 1000,
+            frame_times[-1] * 1000,
+            self._idle_time * 1000
+        )
+
+
+__all__ = ['percentile', 'FrameStats', 'Scheduler']
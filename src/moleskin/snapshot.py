@@ -0,0 +1,84 @@
+import io
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Union
+from pygame.font import Font
+from moleskin.component import Component
+from moleskin.foreground import ForegroundTemplate
+
+FONT_ASSET = 'font'
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def persistent_id(self, obj: Any):
+        if isinstance(obj, Font):
+            key = ForegroundTemplate.font_cache.key(obj)
+            if key is None:
+                raise pickle.PicklingError(f"font {obj} was not resolved through ForegroundTemplate.font_cache")
+
+            return FONT_ASSET, key
+
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid: Any):
+        kind, key = pid
+        if kind == FONT_ASSET:
+            return ForegroundTemplate.font_cache.font(*key)
+
+        raise pickle.UnpicklingError(f"unsupported asset reference '{kind}'")
+
+
+class Snapshot:
+    _magic = b'MSKS'
+    _version = 1
+    _protocol = 5
+    _header = struct.Struct('<4sHH')
+
+    @classmethod
+    def version(cls):
+        return cls._version
+
+    @classmethod
+    def dumps(cls, root: Component) -> bytes:
+        buffer = io.BytesIO()
+        buffer.write(cls._header.pack(cls._magic, cls._version, cls._protocol))
+        _SnapshotPickler(buffer, cls._protocol).dump(root)
+        return buffer.getvalue()
+
+    @classmethod
+    def loads(cls, data: bytes) -> Component:
+        """Restore a tree written by dumps. Snapshots are pickles, so never load one from an untrusted source."""
+        if len(data) < cls._header.size + 2:
+            raise ValueError("snapshot is truncated")
+
+        magic, version, protocol = cls._header.unpack_from(data)
+        if magic != cls._magic:
+            raise ValueError("data is not a moleskin snapshot")
+
+        if version != cls._version:
+            raise ValueError(f"unsupported snapshot version {version} (expected {cls._version})")
+
+        if not 2 <= protocol <= pickle.HIGHEST_PROTOCOL:
+            raise ValueError(
+                f"snapshot uses pickle protocol {protocol}, this Python reads protocols 2 to {pickle.HIGHEST_PROTOCOL}"
+            )
+
+        payload = memoryview(data)[cls._header.size:]
+        if payload[:2] != bytes((pickle.PROTO[0], protocol)):
+            raise ValueError(f"snapshot payload does not match its header protocol {protocol}")
+
+        return _SnapshotUnpickler(io.BytesIO(payload)).load()
+
+    @classmethod
+    def dump(cls, root: Component, path: Union[str, Path]):
+        Path(path).write_bytes(cls.dumps(root))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Component:
+        return cls.loads(Path(path).read_bytes())
+
+
+__all__ = ['Snapshot']
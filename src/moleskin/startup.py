@@ -0,0 +1,172 @@
+import json
+import sys
+from contextlib import contextmanager
+from importlib import import_module
+from importlib.abc import Loader, MetaPathFinder
+from os import getenv
+from pathlib import Path
+from threading import Lock, get_ident
+from time import perf_counter
+from types import ModuleType
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+IMPORT = 'import'
+ASSET = 'asset'
+RENDER = 'render'
+
+
+class StartupEvent(NamedTuple):
+    category: str
+    name: str
+    start: float
+    duration: float
+    thread: int
+
+
+class _TracedLoader(Loader):
+    def __init__(self, loader: Loader, trace: 'StartupTrace'):
+        self._loader = loader
+        self._trace = trace
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType):
+        with self._trace.span(IMPORT, module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+
+class _ImportTracer(MetaPathFinder):
+    def __init__(self, trace: 'StartupTrace'):
+        self._trace = trace
+
+    def find_spec(self, name: str, path, target=None):
+        if name.partition('.')[0] not in self._trace.traced_packages:
+            return None
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TracedLoader(spec.loader, self._trace)
+
+                return spec
+
+        return None
+
+
+class StartupTrace:
+    traced_packages: Tuple[str, ...] = ('moleskin', 'pygame', 'PIL')
+
+    def __init__(self, enabled: bool = False):
+        self._enabled = False
+        self._origin = perf_counter()
+        self._events: List[StartupEvent] = []
+        self._lock = Lock()
+        self._tracer = _ImportTracer(self)
+        if enabled:
+            self.enable()
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    def enable(self):
+        self._enabled = True
+        if self._tracer not in sys.meta_path:
+            sys.meta_path.insert(0, self._tracer)
+
+    def disable(self):
+        self._enabled = False
+        if self._tracer in sys.meta_path:
+            sys.meta_path.remove(self._tracer)
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+    @property
+    def events(self):
+        with self._lock:
+            return tuple(self._events)
+
+    @contextmanager
+    def span(self, category: str, name: str):
+        if not self._enabled:
+            yield
+            return
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            event = StartupEvent(category, name, start - self._origin, perf_counter() - start, get_ident())
+            with self._lock:
+                self._events.append(event)
+
+    def totals(self) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        ends: Dict[Tuple[str, int], float] = {}
+        for event in sorted(self.events, key=lambda event: event.start):
+            key = event.category, event.thread
+            if event.start >= ends.get(key, float('-inf')):
+                ends[key] = event.start + event.duration
+                totals[event.category] = totals.get(event.category, 0.0) + event.duration
+
+        return totals
+
+    def report(self) -> str:
+        events = sorted(self.events, key=lambda event: -event.duration)
+        return '\n'.join((
+            *(f"{category:>8}: {duration * 1000:9.3f} ms" for category, duration in sorted(self.totals().items())),
+            *(f"{event.category:>8}  {event.duration * 1000:9.3f} ms  {event.name}" for event in events)
+        ))
+
+    def to_chrome_trace(self):
+        return {'traceEvents': [
+            {
+                'name': event.name, 'cat': event.category, 'ph': 'X', 'pid': 0, 'tid': event.thread,
+                'ts': event.start * 1e6, 'dur': event.duration * 1e6
+            }
+            for event in self.events
+        ]}
+
+    def dump(self, path: Union[str, Path]):
+        Path(path).write_text(json.dumps(self.to_chrome_trace()))
+
+
+_lazy_assets_varname = 'GAME_LAZY_ASSETS'
+_trace_varname = 'GAME_STARTUP_TRACE'
+_lazy_assets: Optional[bool] = None
+trace = StartupTrace(getenv(_trace_varname, '').lower() in ('1', 'true', 'yes', 'on'))
+
+
+def lazy_assets() -> bool:
+    global _lazy_assets
+    if _lazy_assets is None:
+        _lazy_assets = getenv(_lazy_assets_varname, '').lower() in ('1', 'true', 'yes', 'on')
+
+    return _lazy_assets
+
+
+def set_lazy_assets(lazy: bool):
+    global _lazy_assets
+    _lazy_assets = lazy
+
+
+def load_module(name: str) -> ModuleType:
+    try:
+        return sys.modules[name]
+    except KeyError:
+        pass
+
+    return import_module(name)
+
+
+__all__ = ['IMPORT', 'ASSET', 'RENDER', 'StartupEvent', 'StartupTrace', 'trace', 'lazy_assets', 'set_lazy_assets', 'load_module']
@@ -1,13 +1,100 @@
+from __future__ import annotations
 from abc import ABC, ABCMeta
-from typing import Protocol, TypeVar
+from itertools import count
+from typing import Protocol, TypeVar, Generic, Callable, Optional, Tuple, Any, Dict, FrozenSet, ClassVar
 
 
 class StateModelMeta(ABCMeta):
-    pass
+    def __new__(cls, name, bases, class_dict, **kwargs):
+        fields = tuple(
+            field for field, annotation in class_dict.get('__annotations__', {}).items()
+            if not field.startswith('_') and not str(annotation).startswith(('ClassVar', 'typing.ClassVar'))
+        )
+        defaults = {field: class_dict.pop(field) for field in fields if field in class_dict}
+        class_dict['__slots__'] = fields
+        model_class = super().__new__(cls, name, bases, class_dict, **kwargs)
+
+        bases_mro = tuple(reversed(model_class.__mro__[1:]))
+        model_class._fields = (
+            *dict.fromkeys(field for base in bases_mro for field in getattr(base, '_fields', ())),
+            *fields
+        )
+        model_class._defaults = {
+            **{field: value for base in bases_mro for field, value in getattr(base, '_defaults', {}).items()},
+            **defaults
+        }
+        return model_class
+
+
+def _restore_state_model(model_class: type, values: Tuple[Any, ...]):
+    state = object.__new__(model_class)
+    for field, value in zip(model_class._fields, values):
+        object.__setattr__(state, field, value)
+
+    return state
 
 
 class StateModel(ABC, metaclass=StateModelMeta):
-    pass
+    _fields: ClassVar[Tuple[str, ...]]
+    _defaults: ClassVar[Dict[str, Any]]
+
+    def __init__(self, **fields):
+        for field in self._fields:
+            try:
+                value = fields.pop(field)
+            except KeyError:
+                try:
+                    value = self._defaults[field]
+                except KeyError:
+                    raise TypeError(f"{type(self).__name__} is missing field '{field}'") from None
+
+            object.__setattr__(self, field, value)
+
+        if fields:
+            raise TypeError(f"{type(self).__name__} has no fields {', '.join(map(repr, fields))}")
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable, use replace() instead")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} is immutable, use replace() instead")
+
+    def __reduce__(self):
+        return _restore_state_model, (type(self), self.values)
+
+    def __eq__(self, other):
+        return self is other or (type(other) is type(self) and all(map(unchanged, self.values, other.values)))
+
+    def __hash__(self):
+        return hash((type(self), self.values))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{field}={getattr(self, field)!r}' for field in self._fields)})"
+
+    @property
+    def values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, field) for field in self._fields)
+
+    def replace(self, **changes) -> StateModel:
+        unknown_fields = changes.keys() - set(self._fields)
+        if unknown_fields:
+            raise TypeError(f"{type(self).__name__} has no fields {', '.join(map(repr, unknown_fields))}")
+
+        if all(getattr(self, field) is value for field, value in changes.items()):
+            return self
+
+        return _restore_state_model(type(self), tuple(
+            changes[field] if field in changes else getattr(self, field) for field in self._fields
+        ))
+
+    def changed_fields(self, previous: Optional[StateModel]) -> FrozenSet[str]:
+        if previous is self:
+            return frozenset()
+
+        if type(previous) is not type(self):
+            return frozenset(self._fields)
+
+        return frozenset(field for field in self._fields if getattr(self, field) is not getattr(previous, field))
 
 
 State = TypeVar('State', bound=StateModel)
@@ -19,4 +106,72 @@ class Selector(Protocol[State, SelectedState]):
         pass
 
 
-__all__ = ['StateModelMeta', 'StateModel', 'State', 'SelectedState', 'Selector']
+def unchanged(previous: Any, current: Any) -> bool:
+    return previous is current or previous == current
+
+
+class MemoizedSelector(Generic[State, SelectedState]):
+    def __init__(self, *input_selectors: Selector, combiner: Callable[..., SelectedState]):
+        self._input_selectors = input_selectors
+        self._combiner = combiner
+        self._inputs: Optional[Tuple[Any, ...]] = None
+        self._result: Optional[SelectedState] = None
+        self._recomputations = 0
+
+    @property
+    def recomputations(self):
+        return self._recomputations
+
+    def __call__(self, state: State) -> SelectedState:
+        inputs = tuple(selector(state) for selector in self._input_selectors)
+        if self._inputs is None or not all(map(unchanged, self._inputs, inputs)):
+            self._result = self._combiner(*inputs)
+            self._recomputations += 1
+
+        self._inputs = inputs
+        return self._result
+
+
+def create_selector(*input_selectors: Selector, combiner: Callable[..., SelectedState]) -> MemoizedSelector:
+    return MemoizedSelector(*input_selectors, combiner=combiner)
+
+
+Subscriber = Callable[[State, FrozenSet[str]], None]
+
+
+class Store(Generic[State]):
+    def __init__(self, state: State):
+        self._state = state
+        self._subscriptions: Dict[int, Tuple[Optional[FrozenSet[str]], Subscriber]] = {}
+        self._subscription_ids = count()
+
+    @property
+    def state(self) -> State:
+        return self._state
+
+    def subscribe(self, subscriber: Subscriber, *fields: str) -> Callable[[], None]:
+        subscription_id = next(self._subscription_ids)
+        self._subscriptions[subscription_id] = frozenset(fields) if fields else None, subscriber
+        return lambda: self._subscriptions.pop(subscription_id, None)
+
+    def watch(self, component, *fields: str) -> Callable[[], None]:
+        return self.subscribe(lambda _, __: component.invalidate(), *fields)
+
+    def set(self, state: State) -> State:
+        previous_state, self._state = self._state, state
+        changed_fields = state.changed_fields(previous_state)
+        if changed_fields:
+            for fields, subscriber in tuple(self._subscriptions.values()):
+                if fields is None or not fields.isdisjoint(changed_fields):
+                    subscriber(state, changed_fields)
+
+        return state
+
+    def replace(self, **changes) -> State:
+        return self.set(self._state.replace(**changes))
+
+
+__all__ = [
+    'StateModelMeta', 'StateModel', 'State', 'SelectedState', 'Selector',
+    'unchanged', 'MemoizedSelector', 'create_selector', 'Subscriber', 'Store'
+]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod, ABCMeta
-from typing import TypeVar, Generic, Tuple, cast, Callable
-from moleskin.state import State, StateModel, SelectedState
+from typing import TypeVar, Generic, Tuple, cast, Callable, Any, Hashable
+from weakref import WeakKeyDictionary, WeakValueDictionary
+from pygame import Color
+from moleskin.state import State, StateModel, SelectedState, unchanged
 
 Form = TypeVar('Form', bound=tuple)
 
@@ -25,11 +27,51 @@ class TemplateMeta(ABCMeta):
                 is_singleton = True
 
         template_class._is_singleton = is_singleton
+        template_class._is_interned = kwargs.get('interned', False)
         return template_class
 
+    @classmethod
+    def _intern_key(mcs, value: Any) -> Hashable:
+        if isinstance(value, Color):
+            return Color, tuple(value)
+
+        if type(value) is tuple:
+            return tuple(mcs._intern_key(item) for item in value)
+
+        return type(value), value
+
+    @classmethod
+    def _owned(mcs, value: Any) -> Any:
+        if isinstance(value, Color):
+            return Color(value)
+
+        if type(value) is tuple:
+            return tuple(mcs._owned(item) for item in value)
+
+        return value
+
+    def __call__(cls, *args, **kwargs):
+        if not cls._is_interned:
+            return super().__call__(*args, **kwargs)
+
+        key = (cls, TemplateMeta._intern_key(args), TemplateMeta._intern_key(tuple(sorted(kwargs.items()))))
+        try:
+            template = cls._interned_templates.get(key)
+        except TypeError:
+            return super().__call__(*args, **kwargs)
+
+        if template is None:
+            template = cls._interned_templates[key] = super().__call__(
+                *TemplateMeta._owned(args), **{name: TemplateMeta._owned(value) for name, value in kwargs.items()}
+            )
+
+        return template
+
 
 class Template(ABC, Generic[State, SelectedState, Form], metaclass=TemplateMeta):
+    __slots__ = ('__weakref__',)
     _singleton: Template = None
+    _interned_templates: WeakValueDictionary = WeakValueDictionary()
 
     def __new__(cls, *args, **kwargs):
         if cls._is_singleton:
@@ -41,6 +83,10 @@ class Template(ABC, Generic[State, SelectedState, Form], metaclass=TemplateMeta)
 
         return template
 
+    @classmethod
+    def interned_count(cls) -> int:
+        return len(Template._interned_templates)
+
     @abstractmethod
     def select_state(self, state: State) -> SelectedState:
         pass
@@ -49,6 +95,9 @@ class Template(ABC, Generic[State, SelectedState, Form], metaclass=TemplateMeta)
     def bind(self, state: SelectedState, component) -> Form:
         pass
 
+    def bind_state(self, state: State, component) -> Form:
+        return self.bind(self.select_state(state), component)
+
     def __getstate__(self):
         if not self._is_singleton:
             raise NotImplementedError("template class is not a singleton and does not implement hook __getstate__")
@@ -60,6 +109,33 @@ class Template(ABC, Generic[State, SelectedState, Form], metaclass=TemplateMeta)
         cast(Callable[[None], None], self.__init__)(*state)
 
 
+class MemoizedTemplate(Template[State, SelectedState, Form], ABC, Generic[State, SelectedState, Form]):
+    __slots__ = ('_bindings', '_skipped_binds')
+
+    def __init__(self):
+        self._bindings: WeakKeyDictionary = WeakKeyDictionary()
+        self._skipped_binds = 0
+
+    @property
+    def skipped_binds(self):
+        return self._skipped_binds
+
+    def bind_state(self, state: State, component) -> Form:
+        selected_state = self.select_state(state)
+        try:
+            previous_state, form = self._bindings[component]
+        except KeyError:
+            pass
+        else:
+            if unchanged(previous_state, selected_state):
+                self._skipped_binds += 1
+                return form
+
+        form = self.bind(selected_state, component)
+        self._bindings[component] = selected_state, form
+        return form
+
+
 FixedForm = TypeVar('FixedForm')
 
 
@@ -69,6 +145,8 @@ class FixedFormTemplate(
     Generic[FixedForm],
     singleton=False
 ):
+    __slots__ = ('_form',)
+
     def __init__(self, *form):
         self._form: FixedForm = form
 
@@ -85,4 +163,4 @@ class FixedFormTemplate(
         return self._form
 
 
-__all__ = ['Form', 'Template', 'FixedFormTemplate']
+__all__ = ['Form', 'Template', 'MemoizedTemplate', 'FixedFormTemplate']